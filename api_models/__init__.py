@@ -3,8 +3,27 @@ Pydantic Data Models for AI Fitness Assistant API
 """
 
 from .auth_models import UserRegister, UserLogin, UserProfile, TokenResponse, UpdateProfile, UserStats
-from .chat_models import ChatRequest, ChatResponse, ConversationHistory, ConversationMessage, ConversationsList
-from .health_models import HealthResponse, HealthStatus, ModelStatus, ReadinessResponse, LivenessResponse
+from .chat_models import (
+    ChatContext,
+    ChatRequest,
+    ChatResponse,
+    ConversationHistory,
+    ConversationMessage,
+    ConversationSummary,
+    ConversationsList,
+    ConversationTurnsColumnar,
+    conversation_turns_columnar_adapter
+)
+from .health_models import (
+    HealthResponse,
+    HealthStatus,
+    ReadinessChecks,
+    ModelStatus,
+    DatabaseStatus,
+    SystemMetrics,
+    ReadinessResponse,
+    LivenessResponse
+)
 from .error_models import (
     ErrorResponse, 
     ValidationErrorResponse, 
@@ -13,7 +32,22 @@ from .error_models import (
     RateLimitErrorResponse,
     ServerErrorResponse
 )
-from .base_models import BaseTimestamp, BaseResponse, PaginationParams, PaginatedResponse
+from .base_models import TrustedModel, BaseTimestamp, BaseResponse, PaginatedResponse, epoch_seconds
+
+
+def add_schema_examples(openapi_schema: dict) -> dict:
+    """Attach the model examples to a generated OpenAPI schema"""
+    # Imported here so the example payloads are only loaded when the docs are built
+    from ._examples import EXAMPLES
+    
+    schemas = openapi_schema.get("components", {}).get("schemas", {})
+    for name, example in EXAMPLES.items():
+        # FastAPI splits models used for both input and output into two schemas
+        for schema_name in (name, f"{name}-Input", f"{name}-Output"):
+            if schema_name in schemas:
+                schemas[schema_name]["example"] = example
+    return openapi_schema
+
 
 __all__ = [
     # Auth models
@@ -24,15 +58,22 @@ __all__ = [
     "UpdateProfile",
     "UserStats",
     # Chat models
+    "ChatContext",
     "ChatRequest",
     "ChatResponse",
     "ConversationHistory",
     "ConversationMessage",
+    "ConversationSummary",
     "ConversationsList",
+    "ConversationTurnsColumnar",
+    "conversation_turns_columnar_adapter",
     # Health models
     "HealthResponse",
     "HealthStatus",
+    "ReadinessChecks",
     "ModelStatus",
+    "DatabaseStatus",
+    "SystemMetrics",
     "ReadinessResponse", 
     "LivenessResponse",
     # Error models
@@ -43,8 +84,11 @@ __all__ = [
     "RateLimitErrorResponse",
     "ServerErrorResponse",
     # Base models
+    "TrustedModel",
     "BaseTimestamp",
     "BaseResponse",
-    "PaginationParams",
-    "PaginatedResponse"
+    "PaginatedResponse",
+    "epoch_seconds",
+    # OpenAPI helpers
+    "add_schema_examples"
 ]
\ No newline at end of file
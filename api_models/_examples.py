@@ -0,0 +1,213 @@
+"""
+OpenAPI Examples for the API Models
+
+Kept out of the model classes so they are only loaded when the OpenAPI
+schema is generated.
+"""
+
+EXAMPLES = {
+    "UserRegister": {
+        "email": "user@example.com",
+        "password": "secure123",
+        "first_name": "John",
+        "last_name": "Doe",
+        "fitness_goals": "Build muscle and improve cardio"
+    },
+    "UserLogin": {
+        "email": "user@example.com",
+        "password": "secure123"
+    },
+    "TokenResponse": {
+        "access_token": "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9...",
+        "token_type": "bearer",
+        "expires_in": 86400,
+        "user_id": "123e4567-e89b-12d3-a456-426614174000"
+    },
+    "UserProfile": {
+        "user_id": "123e4567-e89b-12d3-a456-426614174000",
+        "email": "user@example.com",
+        "first_name": "John",
+        "last_name": "Doe",
+        "fitness_goals": "Build muscle and improve cardio",
+        "created_at": "2023-09-27T10:00:00Z",
+        "last_active": "2023-09-28T15:30:00Z",
+        "is_active": True
+    },
+    "UserStats": {
+        "user_id": "123e4567-e89b-12d3-a456-426614174000",
+        "total_conversations": 25,
+        "total_messages": 150,
+        "days_active": 15,
+        "member_since": "2023-09-01T10:00:00Z",
+        "last_active": "2023-09-28T15:30:00Z"
+    },
+    "ChatRequest": {
+        "message": "What's a good workout for building chest muscles?",
+        "conversation_id": "conv-123e4567-e89b-12d3-a456-426614174000",
+        "context": {
+            "user_level": "intermediate",
+            "available_equipment": ["dumbbells", "bench"]
+        }
+    },
+    "ChatResponse": {
+        "message": "What's a good workout for building chest muscles?",
+        "response": "For chest development, I recommend focusing on compound movements like bench press, push-ups, and dips...",
+        "conversation_id": "conv-123e4567-e89b-12d3-a456-426614174000",
+        "timestamp": 1695915000,
+        "tokens_used": 45,
+        "response_time_ms": 1200
+    },
+    "ConversationHistory": {
+        "user_id": "123e4567-e89b-12d3-a456-426614174000",
+        "conversation_id": "conv-123e4567-e89b-12d3-a456-426614174000",
+        "messages": [
+            {
+                "message_id": "msg-1",
+                "user_message": "Hello",
+                "ai_response": "Hi! How can I help with your fitness journey today?",
+                "timestamp": 1695915000,
+                "tokens_used": 15,
+                "context": {}
+            }
+        ],
+        "total_messages": 1,
+        "created_at": "2023-09-28T15:30:00Z",
+        "last_updated": "2023-09-28T15:30:00Z"
+    },
+    "ConversationsList": {
+        "user_id": "123e4567-e89b-12d3-a456-426614174000",
+        "conversations": [
+            {
+                "conversation_id": "conv-123",
+                "first_message": "What's a good workout routine?",
+                "last_message_time": "2023-09-28T15:30:00Z",
+                "message_count": 5
+            }
+        ],
+        "total_conversations": 10,
+        "limit": 50,
+        "offset": 0
+    },
+    "ModelStatus": {
+        "loaded": True,
+        "model_name": "mistral-7b-instruct",
+        "model_path": "/app/models/mistral-7b-instruct",
+        "memory_usage_mb": 13500.5,
+        "last_inference_time": 1695914985
+    },
+    "DatabaseStatus": {
+        "connected": True,
+        "connection_pool_size": 5,
+        "last_query_time": 1695915000
+    },
+    "SystemMetrics": {
+        "cpu_usage_percent": 25.5,
+        "memory_usage_percent": 68.2,
+        "disk_usage_percent": 45.0,
+        "uptime_seconds": 86400.5
+    },
+    "HealthResponse": {
+        "status": "healthy",
+        "timestamp": 1695915000,
+        "version": "1.0.0",
+        "environment": "production",
+        "model_status": {
+            "loaded": True,
+            "model_name": "mistral-7b-instruct",
+            "model_path": "/app/models/mistral-7b-instruct",
+            "memory_usage_mb": 13500.5,
+            "last_inference_time": 1695914985
+        },
+        "database_status": {
+            "connected": True,
+            "connection_pool_size": 5,
+            "last_query_time": 1695915000
+        },
+        "system_metrics": {
+            "cpu_usage_percent": 25.5,
+            "memory_usage_percent": 68.2,
+            "disk_usage_percent": 45.0,
+            "uptime_seconds": 86400.5
+        },
+        "checks_passed": 4,
+        "checks_total": 4,
+        "details": {
+            "kubernetes_ready": True,
+            "load_balancer_healthy": True
+        }
+    },
+    "ReadinessResponse": {
+        "ready": True,
+        "timestamp": 1695915000,
+        "checks": {
+            "model_loaded": True,
+            "database_connected": True,
+            "cache_available": True
+        }
+    },
+    "LivenessResponse": {
+        "alive": True,
+        "timestamp": 1695915000,
+        "uptime_seconds": 3600.5
+    },
+    "ErrorDetail": {
+        "field": "email",
+        "message": "Invalid email format",
+        "error_code": "VALIDATION_ERROR"
+    },
+    "ErrorResponse": {
+        "success": False,
+        "error": "VALIDATION_ERROR",
+        "message": "Request validation failed",
+        "timestamp": "2023-09-28T15:30:00Z",
+        "request_id": "req-123e4567-e89b-12d3-a456-426614174000",
+        "details": [
+            {
+                "field": "email",
+                "message": "Invalid email format",
+                "error_code": "INVALID_FORMAT"
+            }
+        ]
+    },
+    "ValidationErrorResponse": {
+        "success": False,
+        "error": "VALIDATION_ERROR",
+        "message": "Request validation failed",
+        "timestamp": "2023-09-28T15:30:00Z",
+        "validation_errors": [
+            {
+                "loc": ["password"],
+                "msg": "ensure this value has at least 8 characters",
+                "type": "value_error.any_str.min_length"
+            }
+        ]
+    },
+    "AuthenticationErrorResponse": {
+        "success": False,
+        "error": "AUTHENTICATION_ERROR",
+        "message": "Invalid credentials provided",
+        "timestamp": "2023-09-28T15:30:00Z"
+    },
+    "AuthorizationErrorResponse": {
+        "success": False,
+        "error": "AUTHORIZATION_ERROR",
+        "message": "Insufficient permissions to access this resource",
+        "timestamp": "2023-09-28T15:30:00Z",
+        "required_permission": "admin"
+    },
+    "RateLimitErrorResponse": {
+        "success": False,
+        "error": "RATE_LIMIT_EXCEEDED",
+        "message": "Too many requests. Please try again later.",
+        "timestamp": "2023-09-28T15:30:00Z",
+        "retry_after_seconds": 60,
+        "limit": 100
+    },
+    "ServerErrorResponse": {
+        "success": False,
+        "error": "INTERNAL_SERVER_ERROR",
+        "message": "An internal server error occurred",
+        "timestamp": "2023-09-28T15:30:00Z",
+        "error_id": "err-123e4567-e89b-12d3-a456-426614174000"
+    }
+}
@@ -2,10 +2,17 @@
 Authentication and User Models
 """
 
-from pydantic import BaseModel, EmailStr, Field, validator
+import re
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 from datetime import datetime
 from typing import Optional
-from .base_models import BaseTimestamp
+from .base_models import BaseTimestamp, TrustedModel
+
+# Compiled once so the password checks run as C-level regex scans
+_HAS_DIGIT = re.compile(r"\d").search
+_HAS_ALPHA = re.compile(r"[^\W\d_]").search
+# Syntactic check only; the user lookup is what rejects unknown addresses
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
 
 
 class UserRegister(BaseModel):
@@ -16,64 +23,50 @@ class UserRegister(BaseModel):
     last_name: str = Field(..., min_length=1, max_length=50, description="Last name")
     fitness_goals: Optional[str] = Field(None, max_length=500, description="User's fitness goals")
     
-    @validator('password')
+    @field_validator('password', mode='after')
+    @classmethod
     def validate_password(cls, v):
         """Validate password strength"""
         if len(v) < 8:
             raise ValueError('Password must be at least 8 characters long')
-        if not any(c.isdigit() for c in v):
+        if not _HAS_DIGIT(v):
             raise ValueError('Password must contain at least one digit')
-        if not any(c.isalpha() for c in v):
+        if not _HAS_ALPHA(v):
             raise ValueError('Password must contain at least one letter')
         return v
     
-    class Config:
-        extra = "forbid"
-        json_schema_extra = {
-            "example": {
-                "email": "user@example.com",
-                "password": "secure123",
-                "first_name": "John",
-                "last_name": "Doe",
-                "fitness_goals": "Build muscle and improve cardio"
-            }
-        }
+    model_config = ConfigDict(defer_build=True, extra="forbid")
 
 
 class UserLogin(BaseModel):
     """User login request"""
-    email: EmailStr = Field(..., description="User's email address")
+    email: str = Field(..., description="User's email address")
     password: str = Field(..., description="User's password")
     
-    class Config:
-        extra = "forbid"
-        json_schema_extra = {
-            "example": {
-                "email": "user@example.com",
-                "password": "secure123"
-            }
-        }
+    @field_validator('email', mode='after')
+    @classmethod
+    def validate_email(cls, v):
+        """Cheap email syntax check for the login hot path"""
+        if not _EMAIL_RE.match(v):
+            raise ValueError('value is not a valid email address')
+        # Lowercase the domain only, matching EmailStr normalization on register
+        local, _, domain = v.rpartition('@')
+        return f"{local}@{domain.lower()}"
+    
+    model_config = ConfigDict(defer_build=True, extra="forbid")
 
 
-class TokenResponse(BaseModel):
+class TokenResponse(TrustedModel):
     """Authentication token response"""
     access_token: str = Field(..., description="JWT access token")
     token_type: str = Field(default="bearer", description="Token type")
     expires_in: int = Field(..., description="Token expiration in seconds")
     user_id: str = Field(..., description="User ID")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "access_token": "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9...",
-                "token_type": "bearer",
-                "expires_in": 86400,
-                "user_id": "123e4567-e89b-12d3-a456-426614174000"
-            }
-        }
+    model_config = ConfigDict(defer_build=True, frozen=True, extra="forbid")
 
 
-class UserProfile(BaseModel):
+class UserProfile(TrustedModel):
     """User profile information"""
     user_id: str = Field(..., description="Unique user identifier")
     email: EmailStr = Field(..., description="User's email address")
@@ -84,19 +77,7 @@ class UserProfile(BaseModel):
     last_active: datetime = Field(..., description="Last activity timestamp")
     is_active: bool = Field(default=True, description="Account status")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "user_id": "123e4567-e89b-12d3-a456-426614174000",
-                "email": "user@example.com",
-                "first_name": "John",
-                "last_name": "Doe",
-                "fitness_goals": "Build muscle and improve cardio",
-                "created_at": "2023-09-27T10:00:00Z",
-                "last_active": "2023-09-28T15:30:00Z",
-                "is_active": True
-            }
-        }
+    model_config = ConfigDict(defer_build=True, frozen=True, extra="forbid")
 
 
 class UpdateProfile(BaseModel):
@@ -105,11 +86,10 @@ class UpdateProfile(BaseModel):
     last_name: Optional[str] = Field(None, min_length=1, max_length=50)
     fitness_goals: Optional[str] = Field(None, max_length=500)
     
-    class Config:
-        extra = "forbid"
+    model_config = ConfigDict(defer_build=True, extra="forbid")
 
 
-class UserStats(BaseModel):
+class UserStats(TrustedModel):
     """User activity statistics"""
     user_id: str = Field(..., description="User identifier")
     total_conversations: int = Field(..., description="Total number of conversations")
@@ -118,14 +98,4 @@ class UserStats(BaseModel):
     member_since: datetime = Field(..., description="Account creation date")
     last_active: datetime = Field(..., description="Last activity timestamp")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "user_id": "123e4567-e89b-12d3-a456-426614174000",
-                "total_conversations": 25,
-                "total_messages": 150,
-                "days_active": 15,
-                "member_since": "2023-09-01T10:00:00Z",
-                "last_active": "2023-09-28T15:30:00Z"
-            }
-        }
\ No newline at end of file
+    model_config = ConfigDict(defer_build=True, frozen=True, extra="forbid")
\ No newline at end of file
@@ -2,31 +2,62 @@
 Base Pydantic Models for Common Patterns
 """
 
-from pydantic import BaseModel
-from datetime import datetime
+from pydantic import BaseModel, ConfigDict, Field, PlainSerializer
+from datetime import datetime, timezone
 from typing import Optional
+from typing_extensions import Annotated
+
+
+def epoch_seconds(value: datetime) -> int:
+    """Convert a datetime to integer Unix seconds (naive values are UTC)"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+# Datetime that goes over the wire as integer Unix seconds instead of an
+# ISO-8601 string; input still accepts either form
+EpochDatetime = Annotated[datetime, PlainSerializer(epoch_seconds, return_type=int, when_used="json")]
+
+
+class TrustedModel(BaseModel):
+    """Base model for responses built from server-side data"""
+
+    @classmethod
+    def from_trusted(cls, **data):
+        """
+        Build an instance without running validation.
+
+        This bypasses every field validator, so only call it from service code
+        with data that originates server-side (DB rows, computed values) - never
+        with anything taken from the request.
+        """
+        # model_construct puts passed fields before defaulted ones; fill the
+        # defaults here so the instance (and its JSON) keeps declaration order
+        values = {}
+        for name, field in cls.model_fields.items():
+            if name in data:
+                values[name] = data[name]
+            elif not field.is_required():
+                values[name] = field.get_default(call_default_factory=True)
+        return cls.model_construct(_fields_set=set(data), **values)
 
 
 class BaseTimestamp(BaseModel):
     """Base model with timestamp fields"""
     created_at: datetime
     updated_at: Optional[datetime] = None
+    
+    model_config = ConfigDict(defer_build=True)
 
 
 class BaseResponse(BaseModel):
     """Base response model"""
     success: bool = True
     message: Optional[str] = None
-    timestamp: datetime = datetime.utcnow()
-
-
-class PaginationParams(BaseModel):
-    """Pagination parameters for list endpoints"""
-    limit: int = 50
-    offset: int = 0
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
     
-    class Config:
-        extra = "forbid"
+    model_config = ConfigDict(defer_build=True)
 
 
 class PaginatedResponse(BaseModel):
@@ -34,4 +65,6 @@ class PaginatedResponse(BaseModel):
     total: int
     limit: int
     offset: int
-    has_more: bool
\ No newline at end of file
+    has_more: bool
+    
+    model_config = ConfigDict(defer_build=True)
\ No newline at end of file
@@ -2,29 +2,34 @@
 Chat and Conversation Models
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List
+from typing_extensions import TypedDict
+from .base_models import EpochDatetime, TrustedModel
+
+
+class ChatContext(TypedDict, total=False):
+    """Additional context sent along with a chat message"""
+    user_level: str
+    available_equipment: List[str]
+
+
+class ConversationSummary(TypedDict):
+    """Summary of a single conversation"""
+    conversation_id: str
+    first_message: str
+    last_message_time: datetime
+    message_count: int
 
 
 class ChatRequest(BaseModel):
     """Chat message request"""
     message: str = Field(..., min_length=1, max_length=2000, description="User message")
     conversation_id: Optional[str] = Field(None, description="Conversation ID to continue existing chat")
-    context: Optional[Dict[str, Any]] = Field(None, description="Additional context for the AI")
+    context: Optional[ChatContext] = Field(None, description="Additional context for the AI")
     
-    class Config:
-        extra = "forbid"
-        json_schema_extra = {
-            "example": {
-                "message": "What's a good workout for building chest muscles?",
-                "conversation_id": "conv-123e4567-e89b-12d3-a456-426614174000",
-                "context": {
-                    "user_level": "intermediate",
-                    "available_equipment": ["dumbbells", "bench"]
-                }
-            }
-        }
+    model_config = ConfigDict(defer_build=True, extra="forbid")
 
 
 class ChatResponse(BaseModel):
@@ -32,34 +37,26 @@ class ChatResponse(BaseModel):
     message: str = Field(..., description="Original user message")
     response: str = Field(..., description="AI response")
     conversation_id: str = Field(..., description="Conversation identifier")
-    timestamp: datetime = Field(..., description="Response timestamp")
+    timestamp: EpochDatetime = Field(..., description="Response timestamp (Unix seconds)")
     tokens_used: int = Field(..., description="Number of tokens used")
     response_time_ms: Optional[int] = Field(None, description="Response time in milliseconds")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "message": "What's a good workout for building chest muscles?",
-                "response": "For chest development, I recommend focusing on compound movements like bench press, push-ups, and dips...",
-                "conversation_id": "conv-123e4567-e89b-12d3-a456-426614174000",
-                "timestamp": "2023-09-28T15:30:00Z",
-                "tokens_used": 45,
-                "response_time_ms": 1200
-            }
-        }
-
-
-class ConversationMessage(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
+
+class ConversationMessage(TrustedModel):
     """Individual conversation message"""
     message_id: str = Field(..., description="Unique message identifier")
     user_message: str = Field(..., description="User's message")
     ai_response: str = Field(..., description="AI's response")
-    timestamp: datetime = Field(..., description="Message timestamp")
+    timestamp: EpochDatetime = Field(..., description="Message timestamp (Unix seconds)")
     tokens_used: int = Field(..., description="Tokens used for this exchange")
-    context: Optional[Dict[str, Any]] = Field(None, description="Message context")
+    context: Optional[ChatContext] = Field(None, description="Message context")
+    
+    model_config = ConfigDict(defer_build=True, frozen=True, extra="forbid")
 
 
-class ConversationHistory(BaseModel):
+class ConversationHistory(TrustedModel):
     """Conversation history response"""
     user_id: str = Field(..., description="User identifier")
     conversation_id: str = Field(..., description="Conversation identifier")
@@ -68,50 +65,35 @@ class ConversationHistory(BaseModel):
     created_at: datetime = Field(..., description="Conversation start time")
     last_updated: datetime = Field(..., description="Last message timestamp")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "user_id": "123e4567-e89b-12d3-a456-426614174000",
-                "conversation_id": "conv-123e4567-e89b-12d3-a456-426614174000",
-                "messages": [
-                    {
-                        "message_id": "msg-1",
-                        "user_message": "Hello",
-                        "ai_response": "Hi! How can I help with your fitness journey today?",
-                        "timestamp": "2023-09-28T15:30:00Z",
-                        "tokens_used": 15,
-                        "context": {}
-                    }
-                ],
-                "total_messages": 1,
-                "created_at": "2023-09-28T15:30:00Z",
-                "last_updated": "2023-09-28T15:30:00Z"
-            }
-        }
-
-
-class ConversationsList(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
+
+class ConversationsList(TrustedModel):
     """List of user conversations"""
     user_id: str = Field(..., description="User identifier")
-    conversations: List[Dict[str, Any]] = Field(..., description="List of conversation summaries")
+    conversations: List[ConversationSummary] = Field(..., description="List of conversation summaries")
     total_conversations: int = Field(..., description="Total number of conversations")
     limit: int = Field(..., description="Query limit")
     offset: int = Field(..., description="Query offset")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "user_id": "123e4567-e89b-12d3-a456-426614174000",
-                "conversations": [
-                    {
-                        "conversation_id": "conv-123",
-                        "first_message": "What's a good workout routine?",
-                        "last_message_time": "2023-09-28T15:30:00Z",
-                        "message_count": 5
-                    }
-                ],
-                "total_conversations": 10,
-                "limit": 50,
-                "offset": 0
-            }
-        }
\ No newline at end of file
+    model_config = ConfigDict(defer_build=True)
+
+
+class ConversationTurnsColumnar(TypedDict):
+    """Paginated conversation history with one parallel list per field"""
+    user_id: str
+    total_conversations: int
+    limit: int
+    offset: int
+    conversation_ids: List[str]
+    user_messages: List[str]
+    ai_responses: List[str]
+    timestamps: List[EpochDatetime]
+    contexts: List[Optional[ChatContext]]
+    tokens_used: List[int]
+    response_times_ms: List[Optional[int]]
+
+
+# Built once at import so a whole columnar history page is serialized in a
+# single pydantic-core call instead of one trip through the encoder per record
+conversation_turns_columnar_adapter = TypeAdapter(ConversationTurnsColumnar)
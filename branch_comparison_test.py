@@ -4,42 +4,53 @@ Comprehensive test script for FitPubFresh project
 Tests both feature branches: model-setup and eks-cluster-setup
 """
 
+import io
 import os
 import sys
 import subprocess
-import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-def run_command(cmd, capture_output=True):
-    """Run shell command and return result"""
+def run_command(argv, capture_output=True):
+    """Run a command (argv list, no shell) and return result"""
     try:
         if capture_output:
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+            result = subprocess.run(argv, stdin=subprocess.DEVNULL, capture_output=True, text=True)
             return result.returncode == 0, result.stdout.strip(), result.stderr.strip()
         else:
-            result = subprocess.run(cmd, shell=True)
+            result = subprocess.run(argv, stdin=subprocess.DEVNULL)
             return result.returncode == 0, "", ""
     except Exception as e:
         return False, "", str(e)
 
+def resolve_branch(branch):
+    """Return the local branch ref, else its origin counterpart, or None"""
+    for ref in (f"refs/heads/{branch}", f"refs/remotes/origin/{branch}"):
+        success, _, _ = run_command(["git", "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"])
+        if success:
+            return ref
+    return None
+
 def test_git_branches():
     """Test git branch structure"""
     print("🔍 Testing Git Branch Structure...")
     
-    success, branches, error = run_command("git branch -a")
+    # Plumbing output: one full ref name per line, no markers or colour
+    success, refs, error = run_command(
+        ["git", "for-each-ref", "--format=%(refname)", "refs/heads", "refs/remotes/origin"]
+    )
     if not success:
         print(f"❌ Failed to get git branches: {error}")
         return False
     
-    expected_branches = ['main', 'feature/model-setup', 'feature/eks-cluster-setup']
-    found_branches = []
+    branches = {
+        ref.removeprefix('refs/heads/').removeprefix('refs/remotes/origin/')
+        for ref in refs.splitlines()
+    }
     
-    for line in branches.split('\n'):
-        branch = line.strip().replace('*', '').strip()
-        if branch.startswith('remotes/'):
-            branch = branch.replace('remotes/origin/', '')
-        if branch in expected_branches:
-            found_branches.append(branch)
+    expected_branches = ['main', 'feature/model-setup', 'feature/eks-cluster-setup']
+    found_branches = branches.intersection(expected_branches)
     
     for branch in expected_branches:
         if branch in found_branches:
@@ -53,29 +64,30 @@ def test_model_setup_branch():
     """Test the model-setup branch"""
     print("\n🔍 Testing Feature: model-setup branch...")
     
-    # Check if we're on the right branch
-    success, current_branch, _ = run_command("git branch --show-current")
-    if 'model-setup' not in current_branch:
-        print("⚠️  Not on model-setup branch, checking out...")
-        success, _, error = run_command("git checkout feature/model-setup")
-        if not success:
-            print(f"❌ Failed to checkout model-setup branch: {error}")
-            return False
+    ref = resolve_branch("feature/model-setup")
+    if not ref:
+        print("❌ model-setup branch not found locally or on origin")
+        return False
+    
+    # Read .env straight from the branch instead of checking it out; an
+    # untracked .env is unaffected by checkout, so fall back to the one on disk
+    success, content, _ = run_command(["git", "show", f"{ref}:.env"])
+    if not success and Path('.env').exists():
+        content = Path('.env').read_text()
+        success = True
     
     # Test .env file
-    if Path('.env').exists():
+    if success:
         print("✅ .env file exists")
-        with open('.env') as f:
-            content = f.read()
-            if 'MODEL_PATH' in content and 'MODEL_NAME' in content:
-                print("✅ Environment variables configured")
-            else:
-                print("❌ Environment variables not properly configured")
+        if 'MODEL_PATH' in content and 'MODEL_NAME' in content:
+            print("✅ Environment variables configured")
+        else:
+            print("❌ Environment variables not properly configured")
     else:
         print("❌ .env file missing")
         return False
     
-    # Test model files
+    # Test model files (weights are not tracked in git, so check the disk)
     model_path = Path('./models/mistral-7b-instruct')
     if model_path.exists():
         print("✅ Model directory exists")
@@ -91,9 +103,10 @@ def test_model_setup_branch():
                 missing_files.append(file_name)
         
         # Check model weights
-        safetensors_files = list(model_path.glob("*.safetensors"))
+        with os.scandir(model_path) as entries:
+            safetensors_files = [entry for entry in entries if entry.name.endswith(".safetensors")]
         if safetensors_files:
-            total_size = sum(f.stat().st_size for f in safetensors_files) / (1024**3)
+            total_size = sum(entry.stat().st_size for entry in safetensors_files) / (1024**3)
             print(f"✅ Found {len(safetensors_files)} model files ({total_size:.1f} GB)")
         else:
             print("❌ No model weight files found")
@@ -108,15 +121,6 @@ def test_eks_cluster_branch():
     """Test the eks-cluster-setup branch"""
     print("\n🔍 Testing Feature: eks-cluster-setup branch...")
     
-    # Checkout EKS branch
-    success, _, error = run_command("git checkout feature/eks-cluster-setup")
-    if not success:
-        print(f"❌ Failed to checkout eks-cluster-setup branch: {error}")
-        return False
-    
-    print("✅ Switched to eks-cluster-setup branch")
-    
-    # Check key files
     key_files = [
         'cluster-config.yaml',
         'setup.sh', 
@@ -125,9 +129,27 @@ def test_eks_cluster_branch():
         'cost-monitoring.sh'
     ]
     
+    # Read the branch's tree instead of checking it out:
+    # "<mode> <type> <object>\t<path>" per file
+    ref = resolve_branch("feature/eks-cluster-setup")
+    if not ref:
+        print("❌ eks-cluster-setup branch not found locally or on origin")
+        return False
+    success, tree, error = run_command(["git", "ls-tree", ref, "--", *key_files])
+    if not success:
+        print(f"❌ Failed to read eks-cluster-setup branch: {error}")
+        return False
+    
+    print("✅ Read eks-cluster-setup branch")
+    file_modes = {}
+    for line in tree.splitlines():
+        meta, _, path = line.partition('\t')
+        file_modes[path] = meta.split(' ', 1)[0]
+    
+    # Check key files
     missing_files = []
     for file_name in key_files:
-        if Path(file_name).exists():
+        if file_name in file_modes:
             print(f"✅ Found: {file_name}")
         else:
             print(f"❌ Missing: {file_name}")
@@ -136,10 +158,9 @@ def test_eks_cluster_branch():
     # Check if scripts are executable
     executable_files = ['setup.sh', 'cleanup.sh', 'cost-monitoring.sh']
     for file_name in executable_files:
-        file_path = Path(file_name)
-        if file_path.exists() and os.access(file_path, os.X_OK):
+        if file_modes.get(file_name) == '100755':
             print(f"✅ {file_name} is executable")
-        elif file_path.exists():
+        elif file_name in file_modes:
             print(f"⚠️  {file_name} exists but not executable")
         
     return len(missing_files) == 0
@@ -148,68 +169,79 @@ def test_aws_connectivity():
     """Test AWS connectivity and EKS cluster"""
     print("\n🔍 Testing AWS Connectivity...")
     
-    # Test AWS CLI
-    success, output, error = run_command("aws sts get-caller-identity")
-    if success:
-        try:
-            identity = json.loads(output)
-            print(f"✅ AWS CLI configured - Account: {identity.get('Account')}")
-            print(f"   User: {identity.get('Arn', 'Unknown')}")
-        except:
-            print("✅ AWS CLI working but couldn't parse identity")
-    else:
-        print(f"❌ AWS CLI not configured: {error}")
+    try:
+        import boto3
+        from botocore.exceptions import BotoCoreError, ClientError
+    except ImportError:
+        print("❌ boto3 not installed (pip install boto3)")
+        return False
+    
+    # One session for all calls: the SDK loads once and clients share a connection pool
+    session = boto3.Session(region_name="us-east-1")
+    
+    # Test AWS credentials
+    try:
+        identity = session.client("sts").get_caller_identity()
+        print(f"✅ AWS credentials configured - Account: {identity.get('Account')}")
+        print(f"   User: {identity.get('Arn', 'Unknown')}")
+    except (BotoCoreError, ClientError) as e:
+        print(f"❌ AWS credentials not configured: {e}")
         return False
     
     # Test EKS cluster
-    success, output, error = run_command("aws eks list-clusters --region us-east-1")
-    if success:
+    eks = session.client("eks")
+    try:
+        cluster_list = eks.list_clusters().get('clusters', [])
+    except (BotoCoreError, ClientError) as e:
+        print(f"❌ Could not list EKS clusters: {e}")
+        return False
+    
+    if 'ai-fitness-dev' in cluster_list:
+        print("✅ EKS cluster 'ai-fitness-dev' exists")
+        
+        # Check cluster status
         try:
-            clusters = json.loads(output)
-            cluster_list = clusters.get('clusters', [])
-            if 'ai-fitness-dev' in cluster_list:
-                print("✅ EKS cluster 'ai-fitness-dev' exists")
-                
-                # Check cluster status
-                success, status_output, _ = run_command(
-                    "aws eks describe-cluster --name ai-fitness-dev --region us-east-1 --query 'cluster.status'"
-                )
-                if success:
-                    status = status_output.strip('"')
-                    print(f"✅ Cluster status: {status}")
-                    
-                    # Check nodes
-                    success, _, _ = run_command("kubectl get nodes")
-                    if success:
-                        print("✅ kubectl can connect to cluster")
-                    else:
-                        print("⚠️  kubectl connection issues (nodes may still be starting)")
-                else:
-                    print("⚠️  Could not get cluster status")
+            status = eks.describe_cluster(name="ai-fitness-dev")["cluster"]["status"]
+            print(f"✅ Cluster status: {status}")
+            
+            # Check nodes
+            success, _, _ = run_command(["kubectl", "get", "nodes"])
+            if success:
+                print("✅ kubectl can connect to cluster")
             else:
-                print("⚠️  EKS cluster 'ai-fitness-dev' not found")
-                print(f"   Available clusters: {cluster_list}")
-        except:
-            print("❌ Could not parse EKS cluster list")
-            return False
+                print("⚠️  kubectl connection issues (nodes may still be starting)")
+        except (BotoCoreError, ClientError):
+            print("⚠️  Could not get cluster status")
     else:
-        print(f"❌ Could not list EKS clusters: {error}")
-        return False
+        print("⚠️  EKS cluster 'ai-fitness-dev' not found")
+        print(f"   Available clusters: {cluster_list}")
     
     return True
 
-def main():
-    """Run comprehensive tests"""
-    print("🚀 FitPubFresh Branch Comparison Test")
-    print("=" * 60)
+class ThreadBufferedStdout(io.TextIOBase):
+    """sys.stdout proxy that buffers output per worker thread"""
     
-    tests = [
-        ("Git Branch Structure", test_git_branches),
-        ("Model Setup Feature", test_model_setup_branch),
-        ("EKS Cluster Feature", test_eks_cluster_branch),
-        ("AWS Connectivity", test_aws_connectivity)
-    ]
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+    
+    def write(self, text):
+        buffer = getattr(self._local, 'buffer', None)
+        return (buffer if buffer is not None else self._stream).write(text)
     
+    def flush(self):
+        self._stream.flush()
+    
+    def run_buffered(self, func, *args):
+        """Run func with this thread's prints buffered; return (result, output)"""
+        self._local.buffer = io.StringIO()
+        try:
+            return func(*args), self._local.buffer.getvalue()
+        finally:
+            self._local.buffer = None
+
+def run_tests(tests):
+    """Run (name, func) tests in order and collect (name, passed) results"""
     results = []
     for test_name, test_func in tests:
         print(f"\n{'='*20} {test_name} {'='*20}")
@@ -219,6 +251,41 @@ def main():
         except Exception as e:
             print(f"❌ Test failed with exception: {str(e)}")
             results.append((test_name, False))
+    return results
+
+def main():
+    """Run comprehensive tests"""
+    print("🚀 FitPubFresh Branch Comparison Test")
+    print("=" * 60)
+    
+    # The git checks only read refs, and the AWS check overlaps with them
+    git_tests = [
+        ("Git Branch Structure", test_git_branches),
+        ("Model Setup Feature", test_model_setup_branch),
+        ("EKS Cluster Feature", test_eks_cluster_branch)
+    ]
+    aws_tests = [
+        ("AWS Connectivity", test_aws_connectivity)
+    ]
+    
+    real_stdout = sys.stdout
+    stdout = ThreadBufferedStdout(real_stdout)
+    sys.stdout = stdout
+    try:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(stdout.run_buffered, run_tests, group)
+                for group in (git_tests, aws_tests)
+            ]
+            outcomes = [future.result() for future in futures]
+    finally:
+        sys.stdout = real_stdout
+    
+    # Replay each group's output in the original test order
+    results = []
+    for group_results, output in outcomes:
+        sys.stdout.write(output)
+        results.extend(group_results)
     
     # Summary
     print("\n" + "=" * 60)
@@ -3,12 +3,17 @@ Configuration Settings for AI Fitness Assistant API
 """
 
 import os
+from functools import lru_cache
 from typing import List, Optional
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
-    """Application settings with environment variable support"""
+    """
+    Application settings with environment variable support.
+
+    password_salt is deprecated and ignored (Argon2id salts each hash).
+    """
     
     # Application
     app_name: str = "AI Fitness Assistant API"
@@ -20,12 +25,14 @@ class Settings(BaseSettings):
     secret_key: str = "change-this-in-production"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 1440  # 24 hours
-    password_salt: str = "fitness-app-salt"
+    # Deprecated and ignored: passwords are hashed with Argon2id, which uses a
+    # random per-hash salt. Kept only so existing env files with PASSWORD_SALT load
+    password_salt: Optional[str] = None
     
     # Server
     host: str = "0.0.0.0"
     port: int = 8000
-    workers: int = 4
+    workers: int = 1  # In-memory stores are per process; scale out only with a shared store
     
     # Database
     database_url: Optional[str] = None
@@ -40,6 +47,7 @@ class Settings(BaseSettings):
     vllm_engine_args: str = "--max-model-len=4096 --dtype=half"
     enable_cuda: bool = True
     mock_ai_responses: bool = True  # Use mock responses by default
+    max_history: int = 1000  # Conversation turns kept per user
     
     # CORS
     cors_origins: List[str] = ["*"]
@@ -47,6 +55,9 @@ class Settings(BaseSettings):
     cors_allow_methods: List[str] = ["*"]
     cors_allow_headers: List[str] = ["*"]
     
+    # Trusted Host header values ("*" accepts any host)
+    trusted_hosts: List[str] = ["*"]
+    
     # Rate Limiting
     rate_limit_per_minute: int = 60
     
@@ -78,10 +89,7 @@ class Settings(BaseSettings):
         }
 
 
-# Global settings instance
-settings = Settings()
-
-
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get application settings"""
-    return settings
\ No newline at end of file
+    """Get application settings (built on first call, then cached)"""
+    return Settings()
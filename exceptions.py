@@ -3,26 +3,38 @@ Exception Handlers for AI Fitness Assistant API
 """
 
 import logging
-import traceback
-import uuid
+import secrets
 from datetime import datetime
 from fastapi import Request, HTTPException, status
-from fastapi.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
 from pydantic import ValidationError
 from typing import Union
 
-from models.error_models import (
+from api_models.error_models import (
+    ErrorDetail,
     ErrorResponse,
     ValidationErrorResponse,
     AuthenticationErrorResponse,
     AuthorizationErrorResponse,
     ServerErrorResponse
 )
+from responses import ModelResponse
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Map common HTTP exceptions to our error format
+_ERROR_TYPE_MAP = {
+    401: "AUTHENTICATION_ERROR",
+    403: "AUTHORIZATION_ERROR", 
+    404: "NOT_FOUND",
+    405: "METHOD_NOT_ALLOWED",
+    429: "RATE_LIMIT_EXCEEDED",
+    500: "INTERNAL_SERVER_ERROR",
+    503: "SERVICE_UNAVAILABLE"
+}
+
 
 class APIException(HTTPException):
     """Custom API Exception with enhanced error handling"""
@@ -39,7 +51,7 @@ class APIException(HTTPException):
         self.error_type = error_type
         self.message = message
         self.details = details or []
-        self.request_id = request_id or str(uuid.uuid4())
+        self.request_id = request_id or secrets.token_hex(16)
 
 
 class AuthenticationException(APIException):
@@ -89,76 +101,69 @@ class ModelException(APIException):
         )
 
 
-async def api_exception_handler(request: Request, exc: APIException) -> JSONResponse:
+async def api_exception_handler(request: Request, exc: APIException) -> ModelResponse:
     """Handle custom API exceptions"""
-    logger.error(f"API Exception: {exc.error_type} - {exc.message}")
+    logger.error("API Exception: %s - %s", exc.error_type, exc.message)
     
-    return JSONResponse(
-        status_code=exc.status_code,
-        content=ErrorResponse(
+    # details come from callers, so validate them; the rest is built here
+    return ModelResponse(
+        ErrorResponse.from_trusted(
             error=exc.error_type,
             message=exc.message,
             request_id=exc.request_id,
-            details=exc.details
-        ).dict()
+            details=[ErrorDetail.model_validate(detail) for detail in exc.details]
+        ),
+        status_code=exc.status_code
     )
 
 
-async def validation_exception_handler(request: Request, exc: Union[RequestValidationError, ValidationError]) -> JSONResponse:
+async def validation_exception_handler(request: Request, exc: Union[RequestValidationError, ValidationError]) -> ModelResponse:
     """Handle Pydantic validation errors"""
-    logger.warning(f"Validation error: {exc}")
+    logger.warning("Validation error: %s", exc)
     
     # Extract validation errors
     validation_errors = []
     if hasattr(exc, 'errors'):
-        validation_errors = exc.errors()
+        # Error ctx can hold exception instances; encode them the way FastAPI does
+        validation_errors = jsonable_encoder(exc.errors())
     
-    return JSONResponse(
-        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-        content=ValidationErrorResponse(
+    return ModelResponse(
+        ValidationErrorResponse.from_trusted(
             validation_errors=validation_errors
-        ).dict()
+        ),
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY
     )
 
 
-async def http_exception_handler(request: Request, exc: HTTPException) -> JSONResponse:
+async def http_exception_handler(request: Request, exc: HTTPException) -> ModelResponse:
     """Handle FastAPI HTTP exceptions"""
-    logger.warning(f"HTTP Exception: {exc.status_code} - {exc.detail}")
-    
-    # Map common HTTP exceptions to our error format
-    error_type_map = {
-        401: "AUTHENTICATION_ERROR",
-        403: "AUTHORIZATION_ERROR", 
-        404: "NOT_FOUND",
-        405: "METHOD_NOT_ALLOWED",
-        429: "RATE_LIMIT_EXCEEDED",
-        500: "INTERNAL_SERVER_ERROR",
-        503: "SERVICE_UNAVAILABLE"
-    }
+    logger.warning("HTTP Exception: %s - %s", exc.status_code, exc.detail)
     
-    error_type = error_type_map.get(exc.status_code, "HTTP_ERROR")
+    error_type = _ERROR_TYPE_MAP.get(exc.status_code, "HTTP_ERROR")
+    detail = exc.detail if isinstance(exc.detail, str) else str(exc.detail)
     
-    return JSONResponse(
-        status_code=exc.status_code,
-        content=ErrorResponse(
+    return ModelResponse(
+        ErrorResponse.from_trusted(
             error=error_type,
-            message=str(exc.detail)
-        ).dict()
+            message=detail
+        ),
+        status_code=exc.status_code,
+        headers=getattr(exc, "headers", None)
     )
 
 
-async def general_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+async def general_exception_handler(request: Request, exc: Exception) -> ModelResponse:
     """Handle unexpected exceptions"""
-    error_id = str(uuid.uuid4())
-    logger.error(f"Unhandled exception [{error_id}]: {str(exc)}")
-    logger.error(f"Traceback: {traceback.format_exc()}")
+    error_id = secrets.token_hex(16)
+    # exc_info defers traceback formatting to handlers that emit the record
+    logger.error("Unhandled exception [%s]: %s", error_id, exc, exc_info=exc)
     
-    return JSONResponse(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content=ServerErrorResponse(
+    return ModelResponse(
+        ServerErrorResponse.from_trusted(
             message="An internal server error occurred",
             error_id=error_id
-        ).dict()
+        ),
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
     )
 
 
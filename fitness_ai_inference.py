@@ -6,20 +6,25 @@ Uses Transformers library to run the Mistral 7B model for fitness-related querie
 
 import os
 import sys
-import torch
 from pathlib import Path
-from transformers import AutoModelForCausalLM, AutoTokenizer
+from dotenv import dotenv_values
+
+# torch and transformers are imported inside the functions that use them:
+# they take seconds to initialize, which the missing-model path never needs
+
+# Context window the prompts plus generated tokens must fit in
+MAX_CONTEXT_TOKENS = 4096
 
 def load_environment():
     """Load environment variables from .env file"""
     env_file = Path('.env')
     if env_file.exists():
         print("📁 Loading environment variables...")
-        with open(env_file) as f:
-            for line in f:
-                if '=' in line and not line.startswith('#'):
-                    key, value = line.strip().split('=', 1)
-                    os.environ[key] = value
+        # Variables already set in the environment take precedence
+        os.environ.update({
+            key: value for key, value in dotenv_values(env_file).items()
+            if value is not None and key not in os.environ
+        })
         print("✅ Environment loaded")
     else:
         print("⚠️  No .env file found")
@@ -28,6 +33,8 @@ def load_environment():
 
 def check_system_resources():
     """Check available system resources"""
+    import torch
+    
     print("\n🔍 System Resource Check:")
     print(f"Python version: {sys.version}")
     
@@ -48,88 +55,118 @@ def check_system_resources():
 
 def load_model(model_path, device="cpu"):
     """Load the Mistral model and tokenizer"""
+    import torch
+    from transformers import AutoModelForCausalLM, AutoTokenizer
+    
     print(f"\n🤖 Loading model from: {model_path}")
     
     try:
         # Load tokenizer
         print("Loading tokenizer...")
-        tokenizer = AutoTokenizer.from_pretrained(model_path)
+        tokenizer = AutoTokenizer.from_pretrained(model_path, use_fast=True)
+        if not tokenizer.is_fast:
+            print("⚠️  Fast (Rust) tokenizer unavailable, falling back to the slow Python tokenizer")
         print("✅ Tokenizer loaded successfully")
         
+        # Half precision everywhere: fp16 on GPUs without bf16 support (pre-Ampere)
+        # and MPS, bf16 otherwise (CPU has no fast fp16 kernels)
+        if device == "mps" or (device == "cuda" and not torch.cuda.is_bf16_supported()):
+            dtype = torch.float16
+        else:
+            dtype = torch.bfloat16
+        
         # Load model
         print("Loading model... (this may take a few minutes)")
         model = AutoModelForCausalLM.from_pretrained(
             model_path,
-            torch_dtype=torch.float16 if device != "cpu" else torch.float32,
-            device_map="auto" if device != "cpu" else None,
+            torch_dtype=dtype,
+            # Weights are materialized directly on the target device (no .to() copy)
+            device_map="auto" if device != "cpu" else {"": "cpu"},
             low_cpu_mem_usage=True
         )
         
-        if device == "cpu":
-            model = model.to(device)
-            
         print("✅ Model loaded successfully")
         
-        return model, tokenizer
+        # Resolved once here so generation doesn't walk the parameters per call
+        return model, tokenizer, model.device
         
     except Exception as e:
         print(f"❌ Failed to load model: {e}")
-        return None, None
+        return None, None, None
 
-def generate_fitness_response(model, tokenizer, prompt, max_length=200):
-    """Generate a fitness-related response"""
+def generate_fitness_responses(model, tokenizer, device, prompts, max_new_tokens=200):
+    """Generate fitness-related responses for a batch of prompts in one pass"""
+    import torch
+    
     try:
-        # Format prompt for instruction following
-        formatted_prompt = f"[INST] {prompt} [/INST]"
+        # Cap the user text, not the formatted prompt, so BOS and the [INST]
+        # markers always survive; prompt + generated tokens must fit in the
+        # context window, and the end of an overlong prompt is kept
+        template_tokens = len(tokenizer("[INST]  [/INST]")["input_ids"])
+        text_budget = MAX_CONTEXT_TOKENS - max_new_tokens - template_tokens
+        capped_prompts = []
+        for prompt in prompts:
+            prompt_ids = tokenizer(prompt, add_special_tokens=False)["input_ids"]
+            if len(prompt_ids) > text_budget:
+                prompt = tokenizer.decode(prompt_ids[-text_budget:])
+            capped_prompts.append(prompt)
+        
+        # Format prompts for instruction following
+        formatted_prompts = [f"[INST] {prompt} [/INST]" for prompt in capped_prompts]
         
-        # Tokenize
-        inputs = tokenizer(formatted_prompt, return_tensors="pt")
+        # Decoder-only models continue from the right edge, so pad on the left
+        if tokenizer.pad_token is None:
+            tokenizer.pad_token = tokenizer.eos_token
+        tokenizer.padding_side = "left"
         
-        # Move to same device as model
-        if next(model.parameters()).device != inputs.input_ids.device:
-            inputs = {k: v.to(next(model.parameters()).device) for k, v in inputs.items()}
+        # Tokenize and move to same device as model
+        inputs = tokenizer(formatted_prompts, return_tensors="pt", padding=True)
+        inputs = inputs.to(device)
         
         # Generate
-        print("🧠 Generating response...")
-        with torch.no_grad():
+        print(f"🧠 Generating {len(prompts)} response(s)...")
+        with torch.inference_mode():
             outputs = model.generate(
-                inputs.input_ids,
-                max_length=len(inputs.input_ids[0]) + max_length,
+                **inputs,
+                max_new_tokens=max_new_tokens,
                 temperature=0.7,
                 do_sample=True,
-                pad_token_id=tokenizer.eos_token_id,
-                num_return_sequences=1
+                pad_token_id=tokenizer.pad_token_id,
+                num_return_sequences=1,
+                use_cache=True
             )
         
-        # Decode response
-        response = tokenizer.decode(outputs[0], skip_special_tokens=True)
+        # Decode only the generated tokens (everything after the padded prompt)
+        prompt_length = inputs["input_ids"].shape[1]
+        responses = tokenizer.batch_decode(outputs[:, prompt_length:], skip_special_tokens=True)
         
-        # Extract only the generated part
-        generated_text = response[len(formatted_prompt):].strip()
-        
-        return generated_text
+        return [response.strip() for response in responses]
         
     except Exception as e:
         print(f"❌ Generation failed: {e}")
         return None
 
+def generate_fitness_response(model, tokenizer, device, prompt, max_new_tokens=200):
+    """Generate a fitness-related response"""
+    responses = generate_fitness_responses(model, tokenizer, device, [prompt], max_new_tokens)
+    return responses[0] if responses else None
+
 def main():
     """Main function to test model inference"""
     print("🏋️ AI Fitness Model Inference Test")
     print("=" * 50)
     
-    # Load environment and check resources
+    # Load environment and verify model files exist before importing torch
     model_path = load_environment()
-    device = check_system_resources()
-    
-    # Verify model files exist
     model_dir = Path(model_path)
     if not model_dir.exists():
         print(f"❌ Model directory not found: {model_path}")
         return
     
+    device = check_system_resources()
+    
     # Load model
-    model, tokenizer = load_model(model_path, device)
+    model, tokenizer, model_device = load_model(model_path, device)
     if model is None or tokenizer is None:
         print("❌ Failed to load model. Cannot continue.")
         return
@@ -145,12 +182,15 @@ def main():
     print(f"\n🎯 Testing {len(fitness_prompts)} fitness prompts:")
     print("=" * 50)
     
-    for i, prompt in enumerate(fitness_prompts, 1):
+    # One batched generate call for all prompts
+    responses = generate_fitness_responses(model, tokenizer, model_device, fitness_prompts)
+    if responses is None:
+        responses = [None] * len(fitness_prompts)
+    
+    for i, (prompt, response) in enumerate(zip(fitness_prompts, responses), 1):
         print(f"\n📝 Prompt {i}: {prompt}")
         print("-" * 40)
         
-        response = generate_fitness_response(model, tokenizer, prompt)
-        
         if response:
             print(f"🤖 Response: {response}")
         else:
@@ -162,7 +202,7 @@ def main():
     print("\n💡 Usage tips:")
     print("1. Model responses may take time on CPU")
     print("2. For production, consider GPU acceleration") 
-    print("3. Adjust max_length for longer/shorter responses")
+    print("3. Adjust max_new_tokens for longer/shorter responses")
     print("4. Fine-tune prompts for better fitness-specific responses")
 
 if __name__ == "__main__":
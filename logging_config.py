@@ -2,22 +2,32 @@
 Logging Configuration for AI Fitness Assistant API
 """
 
+import copy
 import logging
+import logging.handlers
+import queue
 import sys
-from datetime import datetime
-from typing import Any, Dict
+import time
+from typing import Any, Dict, Optional
+import orjson
 from pythonjsonlogger import jsonlogger
 
 
 class CustomJsonFormatter(jsonlogger.JsonFormatter):
     """Custom JSON formatter for structured logging"""
     
+    # Fields that are identical on every record
+    STATIC_FIELDS = {'service': 'ai-fitness-api'}
+    
     def add_fields(self, log_record: Dict[str, Any], record: logging.LogRecord, message_dict: Dict[str, Any]) -> None:
         super().add_fields(log_record, record, message_dict)
         
         # Add custom fields
-        log_record['timestamp'] = datetime.utcnow().isoformat()
-        log_record['service'] = 'ai-fitness-api'
+        # Reuse the clock reading the LogRecord already took
+        log_record['timestamp'] = '%s.%03dZ' % (
+            time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(record.created)), record.msecs
+        )
+        log_record.update(self.STATIC_FIELDS)
         log_record['level'] = record.levelname
         log_record['logger'] = record.name
         
@@ -26,12 +36,38 @@ class CustomJsonFormatter(jsonlogger.JsonFormatter):
             log_record['request_id'] = record.request_id
         if hasattr(record, 'user_id'):
             log_record['user_id'] = record.user_id
+    
+    def jsonify_log_record(self, log_record: Dict[str, Any]) -> str:
+        """Serialize the log record with orjson instead of the stdlib encoder"""
+        return orjson.dumps(
+            log_record,
+            default=self.json_default or str,
+            option=orjson.OPT_NON_STR_KEYS
+        ).decode()
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that leaves traceback formatting to the listener's handlers"""
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge msg % args now so the record shows the arguments as they were
+        # at the logging call, but keep exc_info: the stock prepare() formats
+        # the traceback on the logging thread and folds it into the message
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+# Listener thread that formats and writes records queued by the root logger
+_queue_listener: Optional[logging.handlers.QueueListener] = None
 
 
 def setup_logging(log_level: str = "INFO", json_logs: bool = True) -> None:
     """Setup application logging configuration"""
     
     # Clear existing handlers
+    stop_logging()
     logging.getLogger().handlers.clear()
     
     # Create console handler
@@ -51,10 +87,19 @@ def setup_logging(log_level: str = "INFO", json_logs: bool = True) -> None:
     
     console_handler.setFormatter(formatter)
     
-    # Configure root logger
+    # Configure root logger: callers only enqueue records, the listener
+    # thread does the formatting (including tracebacks) and the blocking write;
+    # only msg % args is merged on the calling thread
+    global _queue_listener
+    log_queue: queue.Queue = queue.Queue(-1)
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue, console_handler, respect_handler_level=True
+    )
+    _queue_listener.start()
+    
     root_logger = logging.getLogger()
     root_logger.setLevel(getattr(logging, log_level.upper(), logging.INFO))
-    root_logger.addHandler(console_handler)
+    root_logger.addHandler(DeferredQueueHandler(log_queue))
     
     # Set specific logger levels
     logging.getLogger("uvicorn").setLevel(logging.INFO)
@@ -64,7 +109,16 @@ def setup_logging(log_level: str = "INFO", json_logs: bool = True) -> None:
     # Suppress noisy third-party loggers
     logging.getLogger("urllib3").setLevel(logging.WARNING)
     logging.getLogger("httpx").setLevel(logging.WARNING)
-    
+
+
+def stop_logging() -> None:
+    """Flush queued records and write directly to the handlers from then on"""
+    global _queue_listener
+    if _queue_listener is None:
+        return
+    listener, _queue_listener = _queue_listener, None
+    listener.stop()
+    logging.getLogger().handlers[:] = listener.handlers
 
 def get_logger(name: str) -> logging.Logger:
     """Get a logger instance with proper configuration"""
@@ -3,31 +3,58 @@ Simple Production FastAPI Application for AI Fitness Assistant
 Compatible with current environment - no complex imports
 """
 
-from fastapi import FastAPI, HTTPException, Depends, status, Request
+from fastapi import FastAPI, HTTPException, Depends, Query, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel, EmailStr, Field
+from collections import deque
 from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
+from cachetools import TTLCache
+import anyio.to_thread
 import hashlib
+from itertools import islice
 import jwt
+import orjson
 import os
+import re
+import threading
 import uuid
 import time
-from typing import Optional, List, Dict, Any
+from typing import Deque, Optional, List, Dict, Any
 
 # Configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "dev-test-secret-key-for-jwt-tokens")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 1440
+ACCESS_TOKEN_TTL = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+ACCESS_TOKEN_TTL_SECONDS = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+MAX_CONVERSATION_HISTORY = 1000  # per user; oldest exchanges are evicted first
 
 # Database simulation
 users_db: Dict[str, Dict[str, Any]] = {}
-conversations_db: Dict[str, List[Dict[str, Any]]] = {}
+email_index: Dict[str, str] = {}  # lowercased email -> user_id
+conversations_db: Dict[str, Deque[Dict[str, Any]]] = {}
 
 # Security
 security = HTTPBearer()
 
+# Verified tokens: blake2b(token) -> (user_id, exp). Short TTL keeps the
+# window for revocation small; verify_token runs in the threadpool, so
+# the cache is guarded by a lock
+_jwt_cache: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+_jwt_cache_lock = threading.Lock()
+
+# Recently issued tokens by claims: a burst of logins for the same user
+# reuses one token, whose expiry then differs by at most the TTL.
+# Only touched from async handlers on the event loop, so no lock
+_token_issue_cache: TTLCache = TTLCache(maxsize=10_000, ttl=15)
+
 # Global state
 app_start_time = time.time()
 ai_model_loaded = False
@@ -81,6 +108,8 @@ class HealthResponse(BaseModel):
 async def lifespan(app: FastAPI):
     global ai_model_loaded
     print("🚀 Starting AI Fitness API...")
+    # Password hashing and sync dependencies share this pool; anyio's default is 40
+    anyio.to_thread.current_default_thread_limiter().total_tokens = max(40, (os.cpu_count() or 1) * 5)
     ai_model_loaded = True
     print("✅ AI Model loaded successfully (mock mode)")
     yield
@@ -91,9 +120,13 @@ app = FastAPI(
     title="AI Fitness Assistant API",
     description="Production-ready API for AI-powered fitness coaching",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
+# Compress larger bodies (chat history, stats); small probes stay uncompressed
+app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=6)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -103,29 +136,72 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Argon2id with OWASP-recommended parameters; salt is per-hash and embedded
+password_hasher = PasswordHasher(time_cost=2, memory_cost=46 * 1024, parallelism=1)
+
+# Entropy for UUIDs is read from the OS in batches instead of one 16-byte
+# urandom syscall per id; the buffer is dropped in forked workers so two
+# processes never hand out the same ids
+_UUID_BATCH = 1024
+_uuid_buf = bytearray()
+_uuid_lock = threading.Lock()
+
+def _reset_uuid_buffer() -> None:
+    global _uuid_buf, _uuid_lock
+    _uuid_buf = bytearray()
+    _uuid_lock = threading.Lock()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_uuid_buffer)
+
+def fast_uuid4() -> uuid.UUID:
+    """Random RFC 4122 version 4 UUID sliced from a batched urandom buffer"""
+    with _uuid_lock:
+        if not _uuid_buf:
+            _uuid_buf.extend(os.urandom(16 * _UUID_BATCH))
+        chunk = bytes(_uuid_buf[-16:])
+        del _uuid_buf[-16:]
+    return uuid.UUID(bytes=chunk, version=4)
+
 # Utility Functions
 def hash_password(password: str) -> str:
-    salt = "fitness-app-salt"
-    return hashlib.sha256((password + salt).encode()).hexdigest()
+    return password_hasher.hash(password)
 
 def verify_password(password: str, hashed: str) -> bool:
-    return hash_password(password) == hashed
+    try:
+        return password_hasher.verify(hashed, password)
+    except (VerificationError, InvalidHashError):
+        return False
 
 def create_access_token(data: dict) -> str:
-    to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    key = tuple(sorted(data.items()))
+    token = _token_issue_cache.get(key)
+    if token is None:
+        to_encode = data.copy()
+        expire = datetime.utcnow() + ACCESS_TOKEN_TTL
+        to_encode.update({"exp": expire})
+        token = _token_issue_cache[key] = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    return token
 
 def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
+    token = credentials.credentials
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    with _jwt_cache_lock:
+        cached = _jwt_cache.get(key)
+    if cached is not None and cached[1] > time.time():
+        return cached[0]
+    
     try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("user_id")
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        user_id: str = payload.get("sub")
         if user_id is None:
             raise HTTPException(status_code=401, detail="Invalid credentials")
-        return user_id
     except jwt.PyJWTError:
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    
+    with _jwt_cache_lock:
+        _jwt_cache[key] = (user_id, payload["exp"])
+    return user_id
 
 def get_current_user(user_id: str = Depends(verify_token)) -> Dict[str, Any]:
     user = users_db.get(user_id)
@@ -133,26 +209,41 @@ def get_current_user(user_id: str = Depends(verify_token)) -> Dict[str, Any]:
         raise HTTPException(status_code=404, detail="User not found")
     return user
 
+# Canned coach replies keyed by topic keyword
+_FITNESS_RESPONSES = {
+    "workout": "🏋️ Here's your personalized workout: Start with 10min dynamic warm-up, then 3 sets of: squats (12 reps), push-ups (10 reps), lunges (10/leg), plank (30s). Cool down with stretching!",
+    "nutrition": "🥗 Nutrition guide: Aim for 1.6-2.2g protein/kg body weight, complex carbs from whole grains, healthy fats (nuts/avocado), 5-9 servings fruits/veggies daily. Stay hydrated!",
+    "motivation": "💪 You've got this! Progress isn't linear - every workout and healthy choice builds momentum. Consistency beats perfection. Celebrate small wins along your fitness journey!",
+    "recovery": "😴 Recovery is key: 7-9hrs quality sleep, include rest days, try gentle yoga/walking for active recovery. Listen to your body's signals!",
+    "cardio": "❤️ Cardio mix: Combine steady-state (20-30min moderate) with HIIT (15-20min intervals). Start 3x/week, find activities you enjoy - dancing, swimming, hiking!",
+    "strength": "🔥 Strength training: Focus on compound movements (deadlifts, squats, bench press), 2-3x/week, progressive overload, proper form over heavy weights!",
+    "flexibility": "🧘 Flexibility routine: Daily 10-15min stretching, focus on tight areas (hips, shoulders, hamstrings), yoga 1-2x/week, stretch after workouts!",
+}
+
+# Reply plus its precomputed token count, and one compiled alternation over
+# all keywords so a message is scanned once instead of once per keyword.
+# Each keyword is its own group; the matching group's index picks the reply
+_FITNESS_REPLIES = tuple((response, len(response.split())) for response in _FITNESS_RESPONSES.values())
+_FITNESS_KEYWORD_RE = re.compile(
+    "|".join(f"({re.escape(key)})" for key in _FITNESS_RESPONSES), re.IGNORECASE
+)
+
+# Fallback reply wraps the user's message; only the message part is counted per call
+_DEFAULT_REPLY_PREFIX = "🤖 As your AI fitness coach, I'm here to help with: "
+_DEFAULT_REPLY_SUFFIX = " I can assist with workout plans, nutrition advice, motivation, recovery tips, cardio routines, strength training, and flexibility! What would you like to focus on?"
+_DEFAULT_REPLY_TOKENS = len(_DEFAULT_REPLY_PREFIX.split()) + len(_DEFAULT_REPLY_SUFFIX.split())
+
 def generate_ai_response(message: str, context: Optional[Dict[str, Any]] = None) -> tuple[str, int]:
     """Enhanced AI response generator"""
-    fitness_responses = {
-        "workout": "🏋️ Here's your personalized workout: Start with 10min dynamic warm-up, then 3 sets of: squats (12 reps), push-ups (10 reps), lunges (10/leg), plank (30s). Cool down with stretching!",
-        "nutrition": "🥗 Nutrition guide: Aim for 1.6-2.2g protein/kg body weight, complex carbs from whole grains, healthy fats (nuts/avocado), 5-9 servings fruits/veggies daily. Stay hydrated!",
-        "motivation": "💪 You've got this! Progress isn't linear - every workout and healthy choice builds momentum. Consistency beats perfection. Celebrate small wins along your fitness journey!",
-        "recovery": "😴 Recovery is key: 7-9hrs quality sleep, include rest days, try gentle yoga/walking for active recovery. Listen to your body's signals!",
-        "cardio": "❤️ Cardio mix: Combine steady-state (20-30min moderate) with HIIT (15-20min intervals). Start 3x/week, find activities you enjoy - dancing, swimming, hiking!",
-        "strength": "🔥 Strength training: Focus on compound movements (deadlifts, squats, bench press), 2-3x/week, progressive overload, proper form over heavy weights!",
-        "flexibility": "🧘 Flexibility routine: Daily 10-15min stretching, focus on tight areas (hips, shoulders, hamstrings), yoga 1-2x/week, stretch after workouts!",
-    }
-    
-    message_lower = message.lower()
-    for key, response in fitness_responses.items():
-        if key in message_lower:
-            return response, len(response.split())
+    # Case-insensitive scan of the original string, no lowered copy
+    match = _FITNESS_KEYWORD_RE.search(message)
+    if match:
+        return _FITNESS_REPLIES[match.lastindex - 1]
     
     # Default personalized response
-    response = f"🤖 As your AI fitness coach, I'm here to help with: {message}. I can assist with workout plans, nutrition advice, motivation, recovery tips, cardio routines, strength training, and flexibility! What would you like to focus on?"
-    return response, len(response.split())
+    message_part = f"{message}."
+    response = f"{_DEFAULT_REPLY_PREFIX}{message_part}{_DEFAULT_REPLY_SUFFIX}"
+    return response, _DEFAULT_REPLY_TOKENS + len(message_part.split())
 
 # API Endpoints
 @app.get("/", tags=["Root"])
@@ -163,15 +254,15 @@ async def root():
         "status": "running",
         "environment": os.getenv("ENVIRONMENT", "development"),
         "docs": "/docs",
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": datetime.utcnow()
     }
 
-@app.get("/health", response_model=HealthResponse, tags=["Health"])
+@app.get("/health", response_model=None, responses={200: {"model": HealthResponse}}, tags=["Health"])
 async def health_check():
     uptime = time.time() - app_start_time
     status_val = "healthy" if ai_model_loaded else "degraded"
     
-    return HealthResponse(
+    return Response(content=HealthResponse(
         status=status_val,
         timestamp=datetime.utcnow(),
         model_loaded=ai_model_loaded,
@@ -180,7 +271,7 @@ async def health_check():
         uptime_seconds=uptime,
         checks_passed=2 if ai_model_loaded else 1,
         checks_total=2
-    )
+    ).model_dump_json(), media_type="application/json")
 
 @app.get("/health/ready", tags=["Health"])
 async def readiness_check():
@@ -204,13 +295,18 @@ async def liveness_check():
 @app.post("/auth/register", tags=["Authentication"])
 async def register_user(user_data: UserRegister):
     # Check if user exists
-    for existing_user in users_db.values():
-        if existing_user["email"] == user_data.email:
-            raise HTTPException(status_code=409, detail="User already exists")
+    email_key = user_data.email.lower()
+    if email_key in email_index:
+        raise HTTPException(status_code=409, detail="User already exists")
     
     # Create user
-    user_id = str(uuid.uuid4())
-    hashed_password = hash_password(user_data.password)
+    user_id = str(fast_uuid4())
+    # Argon2 is CPU- and memory-hard; keep it off the event loop
+    hashed_password = await run_in_threadpool(hash_password, user_data.password)
+    
+    # Re-check: a concurrent registration may have claimed the email during the await
+    if email_key in email_index:
+        raise HTTPException(status_code=409, detail="User already exists")
     
     users_db[user_id] = {
         "user_id": user_id,
@@ -224,83 +320,82 @@ async def register_user(user_data: UserRegister):
         "is_active": True
     }
     
-    conversations_db[user_id] = []
-    access_token = create_access_token({"user_id": user_id, "email": user_data.email})
+    email_index[email_key] = user_id
+    conversations_db[user_id] = deque(maxlen=MAX_CONVERSATION_HISTORY)
+    access_token = create_access_token({"sub": user_id})
     
     return {
         "message": "User registered successfully",
         "user_id": user_id,
         "access_token": access_token,
         "token_type": "bearer",
-        "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        "expires_in": ACCESS_TOKEN_TTL_SECONDS
     }
 
 @app.post("/auth/login", tags=["Authentication"])
 async def login_user(login_data: UserLogin):
-    user = None
-    user_id = None
+    user_id = email_index.get(login_data.email.lower())
+    user = users_db.get(user_id) if user_id else None
     
-    for uid, user_data in users_db.items():
-        if user_data["email"] == login_data.email:
-            user = user_data
-            user_id = uid
-            break
-    
-    if not user or not verify_password(login_data.password, user["password"]):
+    if not user or not await run_in_threadpool(verify_password, login_data.password, user["password"]):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     user["last_active"] = datetime.utcnow()
-    access_token = create_access_token({"user_id": user_id, "email": user["email"]})
+    access_token = create_access_token({"sub": user_id})
     
     return {
         "message": "Login successful",
         "user_id": user_id,
         "access_token": access_token,
         "token_type": "bearer",
-        "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        "expires_in": ACCESS_TOKEN_TTL_SECONDS
     }
 
-@app.post("/chat", response_model=ChatResponse, tags=["Chat"])
+@app.post("/chat", response_model=None, responses={200: {"model": ChatResponse}}, tags=["Chat"])
 async def chat_with_ai(
     chat_request: ChatRequest,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     user_id = current_user["user_id"]
-    start_time = time.time()
+    start_time = time.perf_counter()
     
-    conversation_id = chat_request.conversation_id or str(uuid.uuid4())
+    conversation_id = chat_request.conversation_id or str(fast_uuid4())
     ai_response, tokens_used = generate_ai_response(chat_request.message, chat_request.context)
-    response_time_ms = int((time.time() - start_time) * 1000)
+    response_time_ms = int((time.perf_counter() - start_time) * 1000)
+    # One wall-clock reading for every timestamp this request writes
+    now = datetime.utcnow()
     
     # Save conversation
     conversation_record = {
         "conversation_id": conversation_id,
         "user_message": chat_request.message,
         "ai_response": ai_response,
-        "timestamp": datetime.utcnow(),
+        "timestamp": now,
         "context": chat_request.context,
         "tokens_used": tokens_used,
         "response_time_ms": response_time_ms
     }
     
     if user_id not in conversations_db:
-        conversations_db[user_id] = []
+        conversations_db[user_id] = deque(maxlen=MAX_CONVERSATION_HISTORY)
     conversations_db[user_id].append(conversation_record)
+    # Kept on the user so /stats survives eviction and needs no scan
+    current_user.setdefault("first_conversation_at", now)
     
-    current_user["last_active"] = datetime.utcnow()
+    current_user["last_active"] = now
     
-    return ChatResponse(
+    return Response(content=ChatResponse(
         message=chat_request.message,
         response=ai_response,
         conversation_id=conversation_id,
-        timestamp=conversation_record["timestamp"],
+        timestamp=now,
         tokens_used=tokens_used,
         response_time_ms=response_time_ms
-    )
+    ).model_dump_json(), media_type="application/json")
 
-@app.get("/profile", response_model=UserProfile, tags=["User"])
+@app.get("/profile", response_model=None, responses={200: {"model": UserProfile}}, tags=["User"])
 async def get_user_profile(current_user: Dict[str, Any] = Depends(get_current_user)):
-    return UserProfile(
+    return Response(content=UserProfile(
         user_id=current_user["user_id"],
         email=current_user["email"],
         first_name=current_user["first_name"],
@@ -308,41 +403,53 @@ async def get_user_profile(current_user: Dict[str, Any] = Depends(get_current_us
         fitness_goals=current_user.get("fitness_goals"),
         created_at=current_user["created_at"],
         last_active=current_user["last_active"]
-    )
+    ).model_dump_json(), media_type="application/json")
 
 @app.get("/chat/history/{user_id}", tags=["Chat"])
 async def get_conversation_history(
     user_id: str,
-    limit: int = 50,
-    offset: int = 0,
+    request: Request,
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     if current_user["user_id"] != user_id:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    user_conversations = conversations_db.get(user_id, [])
+    user_conversations = conversations_db.get(user_id, ())
     total = len(user_conversations)
-    conversations_slice = user_conversations[offset:offset + limit]
+    # Snapshot the page: the deque may be appended to while a stream is being sent
+    conversations_slice = list(islice(user_conversations, offset, offset + limit))
     
-    return {
+    # JSON Lines on request: one record per line, encoded as it is sent
+    if "application/x-ndjson" in request.headers.get("accept", ""):
+        return StreamingResponse(
+            (orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE) for record in conversations_slice),
+            media_type="application/x-ndjson",
+            headers={"X-Total-Count": str(total)}
+        )
+    
+    # Records are plain dicts of JSON-native types: hand them straight to orjson
+    # instead of walking them through jsonable_encoder first
+    return ORJSONResponse({
         "user_id": user_id,
         "total_conversations": total,
         "limit": limit,
         "offset": offset,
         "conversations": conversations_slice
-    }
+    })
 
 @app.get("/stats", tags=["Analytics"])
 async def get_user_stats(current_user: Dict[str, Any] = Depends(get_current_user)):
     user_id = current_user["user_id"]
-    user_conversations = conversations_db.get(user_id, [])
+    user_conversations = conversations_db.get(user_id, ())
     
     total_conversations = len(user_conversations)
     total_messages = len(user_conversations)
     days_active = 0
     
-    if user_conversations:
-        first_conversation = min(conv["timestamp"] for conv in user_conversations)
+    first_conversation = current_user.get("first_conversation_at")
+    if first_conversation is not None:
         days_active = (datetime.utcnow() - first_conversation).days + 1
     
     return {
@@ -356,6 +463,21 @@ async def get_user_stats(current_user: Dict[str, Any] = Depends(get_current_user
 
 if __name__ == "__main__":
     import uvicorn
+    environment = os.getenv('ENVIRONMENT', 'development')
     print(f"🚀 Starting AI Fitness Assistant API v1.0.0")
-    print(f"Environment: {os.getenv('ENVIRONMENT', 'development')}")
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    print(f"Environment: {environment}")
+    
+    # Auto-reload runs a single supervised process, so only use it in development.
+    # users_db/conversations_db are per-process dicts, so more than one worker
+    # needs a shared store first; WEB_CONCURRENCY opts in explicitly
+    reload = environment == "development"
+    workers = None if reload else int(os.getenv("WEB_CONCURRENCY", "1"))
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        reload=reload,
+        workers=workers
+    )
\ No newline at end of file
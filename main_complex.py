@@ -3,34 +3,53 @@ Production FastAPI Application for AI Fitness Assistant
 Enhanced with proper error handling, logging, and production patterns
 """
 
-from fastapi import FastAPI, HTTPException, Depends, status, Request
+from fastapi import FastAPI, HTTPException, Depends, Query, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
+from fastapi.openapi.utils import get_openapi
+from starlette.concurrency import run_in_threadpool
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
+from cachetools import TTLCache
+from collections import deque
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from itertools import islice
+import base64
 import hashlib
+import hmac
 import jwt
+import orjson
 import os
+import re
+import threading
 import uuid
 import time
 import psutil
-from typing import Optional, List, Dict, Any
+from typing import Deque, Optional, List, Dict, Any, Literal
 
 # Local imports
 from config import get_settings
-from logging_config import setup_logging, get_logger
+from logging_config import setup_logging, stop_logging, get_logger
 from exceptions import setup_exception_handlers, AuthenticationException, ModelException
-from models import (
+from responses import ModelResponse
+from api_models import (
     # Auth models
     UserRegister, UserLogin, UserProfile, TokenResponse, UpdateProfile, UserStats,
     # Chat models  
     ChatRequest, ChatResponse, ConversationHistory,
+    conversation_turns_columnar_adapter,
     # Health models
     HealthResponse, HealthStatus, ModelStatus, SystemMetrics, ReadinessResponse, LivenessResponse,
     # Error models
-    ErrorResponse
+    ErrorResponse,
+    # Serialization helpers
+    epoch_seconds,
+    # OpenAPI helpers
+    add_schema_examples
 )
 
 # Configuration and logging
@@ -39,16 +58,96 @@ setup_logging(settings.log_level, json_logs=(settings.environment == "production
 logger = get_logger(__name__)
 
 # Database simulation (in production, use PostgreSQL/MongoDB)
-users_db: Dict[str, Dict[str, Any]] = {}
-conversations_db: Dict[str, List[Dict[str, Any]]] = {}
+# Records use fixed __slots__ instead of a per-record dict
+@dataclass
+class UserRecord:
+    """Stored user account"""
+    __slots__ = (
+        "user_id", "email", "password", "first_name", "last_name",
+        "fitness_goals", "created_at", "last_active", "is_active",
+        "total_conversations", "first_conversation_at"
+    )
+    user_id: str
+    email: str
+    password: str
+    first_name: str
+    last_name: str
+    fitness_goals: Optional[str]
+    created_at: datetime
+    last_active: datetime
+    is_active: bool
+    # Aggregates kept up to date by /chat so /stats doesn't scan history
+    total_conversations: int
+    first_conversation_at: Optional[datetime]
+
+@dataclass
+class ConversationRecord:
+    """Stored chat exchange"""
+    __slots__ = (
+        "conversation_id", "user_message", "ai_response", "timestamp",
+        "context", "tokens_used", "response_time_ms"
+    )
+    conversation_id: str
+    user_message: str
+    ai_response: str
+    timestamp: datetime
+    context: Optional[Dict[str, Any]]
+    tokens_used: int
+    response_time_ms: Optional[int]
+
+users_db: Dict[str, UserRecord] = {}
+# Per-user history keeps the newest settings.max_history exchanges
+conversations_db: Dict[str, Deque[ConversationRecord]] = {}
+# Lowercased email -> user_id, so register/login avoid scanning users_db
+email_to_user_id: Dict[str, str] = {}
 
 # Security
 security = HTTPBearer()
 
+# Verified tokens by SHA-256 of the token, so repeat requests skip the
+# signature check. Entries live 30s at most to keep the revocation window
+# small. Only touched from verify_token on the event loop, so no lock
+_jwt_cache: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+# Hit/miss counts are logged at shutdown, never served
+_jwt_cache_stats = {"hits": 0, "misses": 0}
+
+# HS256 tokens are signed without going through jwt.encode: the header
+# segment never changes and the HMAC is resumed from a keyed state, so
+# each call only encodes the claims and finishes one digest
+_JWT_FAST_PATH = settings.algorithm == "HS256"
+_JWT_HEADER_SEGMENT = base64.urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(b"=")
+_jwt_signer = hmac.new(settings.secret_key.encode(), digestmod=hashlib.sha256)
+
+# Argon2id with OWASP-recommended parameters; salt is per-hash and embedded
+password_hasher = PasswordHasher(time_cost=2, memory_cost=46 * 1024, parallelism=1)
+
+# Successful password checks by SHA-256 of password and stored hash, so a
+# burst of logins pays for one Argon2 verify. Failures are not cached, and
+# the lock is needed because verify_password runs in the threadpool
+_pw_verify_cache: TTLCache = TTLCache(maxsize=5_000, ttl=60)
+_pw_verify_cache_lock = threading.Lock()
+
 # Global state
 app_start_time = time.time()
 ai_model_loaded = False
 
+# Liveness payload is fixed-shape, so it is rendered from a bytes template
+# (same wire format as LivenessResponse) instead of the model serializer
+_LIVENESS_TEMPLATE = b'{"alive":true,"timestamp":%d,"uptime_seconds":%.1f}'
+# Probes and proxies may reuse a liveness answer for a second; the ETag is
+# start time plus whole seconds of uptime, so it changes when the cache
+# expires and never repeats across restarts
+_LIVENESS_CACHE_CONTROL = "public, max-age=1, s-maxage=1"
+# Root info only changes with a deploy
+_ROOT_CACHE_CONTROL = "public, max-age=60"
+
+# Models used on the request path (schemas are built lazily, see lifespan)
+SERVED_MODELS = (
+    UserRegister, UserLogin, UpdateProfile, TokenResponse, UserProfile, UserStats,
+    ChatRequest, ChatResponse,
+    HealthResponse, ModelStatus, SystemMetrics, ReadinessResponse, LivenessResponse
+)
+
 # App lifecycle management
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -60,6 +159,11 @@ async def lifespan(app: FastAPI):
     logger.info(f"Environment: {settings.environment}")
     logger.info(f"Debug mode: {settings.debug}")
     
+    # Build the deferred schemas of the models this app serves, once,
+    # before the first request instead of on it
+    for model in SERVED_MODELS:
+        model.model_rebuild(force=False)
+    
     try:
         if not settings.mock_ai_responses:
             # In production, load the actual AI model here
@@ -78,6 +182,11 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("🔄 Shutting down AI Fitness API...")
+    logger.info(
+        "JWT cache: %d hits, %d misses, %d entries",
+        _jwt_cache_stats["hits"], _jwt_cache_stats["misses"], len(_jwt_cache)
+    )
+    stop_logging()
 
 
 # FastAPI App
@@ -86,38 +195,54 @@ app = FastAPI(
     description="Production-ready API for AI-powered fitness coaching with comprehensive error handling",
     version=settings.app_version,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None
 )
 
+def custom_openapi() -> Dict[str, Any]:
+    """Generate the OpenAPI schema once, with the model examples attached"""
+    if app.openapi_schema is None:
+        app.openapi_schema = add_schema_examples(get_openapi(
+            title=app.title,
+            version=app.version,
+            description=app.description,
+            routes=app.routes
+        ))
+    return app.openapi_schema
+
+app.openapi = custom_openapi
+
 # Setup exception handlers
 # setup_exception_handlers(app)
 
-# Middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.cors_origins,
-    allow_credentials=settings.cors_allow_credentials,
-    allow_methods=settings.cors_allow_methods,
-    allow_headers=settings.cors_allow_headers,
-)
+# Middleware (each layer runs on every request, so no-op ones are skipped)
+if settings.cors_origins:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.cors_origins,
+        allow_credentials=settings.cors_allow_credentials,
+        allow_methods=settings.cors_allow_methods,
+        allow_headers=settings.cors_allow_headers,
+    )
 
-if settings.environment == "production":
-    app.add_middleware(TrustedHostMiddleware, allowed_hosts=["*"])
+if settings.environment == "production" and "*" not in settings.trusted_hosts:
+    app.add_middleware(TrustedHostMiddleware, allowed_hosts=settings.trusted_hosts)
 
 # Request logging middleware
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     """Log all requests with timing"""
-    start_time = time.time()
-    request_id = str(uuid.uuid4())
+    start_ns = time.monotonic_ns()
+    request_id = uuid.uuid4().hex
     
-    # Add request ID to request state
+    # Add request ID and a single wall-clock reading to request state
     request.state.request_id = request_id
+    request.state.now = datetime.utcnow()
     
     response = await call_next(request)
     
-    process_time = time.time() - start_time
+    process_ms = (time.monotonic_ns() - start_ns) // 1_000_000
     logger.info(
         f"Request completed",
         extra={
@@ -125,7 +250,7 @@ async def log_requests(request: Request, call_next):
             "method": request.method,
             "url": str(request.url),
             "status_code": response.status_code,
-            "process_time": f"{process_time:.3f}s"
+            "process_ms": process_ms
         }
     )
     
@@ -134,32 +259,65 @@ async def log_requests(request: Request, call_next):
 
 # Utility Functions
 def hash_password(password: str) -> str:
-    """Hash password with salt"""
-    return hashlib.sha256((password + settings.password_salt).encode()).hexdigest()
+    """Hash password with Argon2id (blocking, call from the threadpool)"""
+    return password_hasher.hash(password)
 
 def verify_password(password: str, hashed: str) -> bool:
-    """Verify password against hash"""
-    return hash_password(password) == hashed
+    """Verify password against hash (blocking, call from the threadpool)"""
+    key = hashlib.sha256(password.encode() + b"|" + hashed.encode()).hexdigest()
+    with _pw_verify_cache_lock:
+        if key in _pw_verify_cache:
+            return True
+    try:
+        password_hasher.verify(hashed, password)
+    except (VerificationError, InvalidHashError):
+        return False
+    with _pw_verify_cache_lock:
+        _pw_verify_cache[key] = True
+    return True
 
 def create_access_token(data: dict) -> str:
     """Create JWT access token"""
-    to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
-    to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
-
-def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
+    if not _JWT_FAST_PATH:
+        to_encode = data.copy()
+        expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
+        to_encode.update({"exp": expire})
+        return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
+    
+    claims = {**data, "exp": int(time.time()) + settings.access_token_expire_minutes * 60}
+    signing_input = _JWT_HEADER_SEGMENT + b"." + base64.urlsafe_b64encode(orjson.dumps(claims)).rstrip(b"=")
+    signer = _jwt_signer.copy()
+    signer.update(signing_input)
+    signature = base64.urlsafe_b64encode(signer.digest()).rstrip(b"=")
+    return (signing_input + b"." + signature).decode()
+
+async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
     """Verify JWT token and return user_id"""
+    # Cache hits are a dict probe on the loop; only the signature check on a
+    # miss is offloaded to the threadpool
+    token = credentials.credentials
+    key = hashlib.sha256(token.encode()).hexdigest()
+    cached = _jwt_cache.get(key)
+    if cached is not None and cached[1] > time.time():
+        _jwt_cache_stats["hits"] += 1
+        return cached[0]
+    _jwt_cache_stats["misses"] += 1
+    
+    # Failed decodes are never cached, so bad tokens are always re-checked
     try:
-        payload = jwt.decode(credentials.credentials, settings.secret_key, algorithms=[settings.algorithm])
+        payload = await run_in_threadpool(
+            jwt.decode, token, settings.secret_key, algorithms=[settings.algorithm]
+        )
         user_id: str = payload.get("user_id")
         if user_id is None:
             raise AuthenticationException("Invalid authentication credentials")
-        return user_id
     except jwt.PyJWTError:
         raise AuthenticationException("Invalid authentication credentials")
+    
+    _jwt_cache[key] = (user_id, payload["exp"])
+    return user_id
 
-def get_current_user(user_id: str = Depends(verify_token)) -> Dict[str, Any]:
+async def get_current_user(user_id: str = Depends(verify_token)) -> UserRecord:
     """Get current user from database"""
     user = users_db.get(user_id)
     if not user:
@@ -169,51 +327,86 @@ def get_current_user(user_id: str = Depends(verify_token)) -> Dict[str, Any]:
         )
     return user
 
+# last_active only needs to be this precise, so most requests skip the write
+LAST_ACTIVE_RESOLUTION = timedelta(seconds=30)
+
+def touch_last_active(user: UserRecord, now: datetime) -> None:
+    """Record user activity, unless the stored time is already recent"""
+    if now - user.last_active > LAST_ACTIVE_RESOLUTION:
+        user.last_active = now
+
+# Canned coach replies keyed by topic keyword. Keywords are matched in one
+# regex pass (a group per keyword, so lastindex picks the reply) and word
+# counts are precomputed
+_FITNESS_RESPONSES = {
+    "workout": "Here's a personalized workout plan: Start with 10 minutes of dynamic warm-up, then perform 3 sets of: squats (12 reps), push-ups (10 reps), lunges (10 per leg), and plank (30 seconds). Cool down with 5 minutes of stretching.",
+    "nutrition": "For optimal nutrition, aim for: 1.6-2.2g protein per kg body weight, complex carbohydrates from whole grains, healthy fats from nuts/avocado, and 5-9 servings of fruits/vegetables daily. Stay hydrated with 2-3L water.",
+    "motivation": "Remember, progress isn't always linear! Every workout, healthy meal, and positive choice builds momentum. Consistency beats perfection - you're building stronger habits with each session. Celebrate small wins!",
+    "recovery": "Recovery is crucial for progress! Aim for 7-9 hours of quality sleep, include rest days, try active recovery like walking or gentle yoga, and listen to your body's signals.",
+    "cardio": "For effective cardio: Mix steady-state (20-30 min moderate intensity) with HIIT (15-20 min with intervals). Start with 3x/week and gradually increase. Find activities you enjoy - dancing, swimming, hiking!",
+}
+_FITNESS_REPLIES = tuple((response, len(response.split())) for response in _FITNESS_RESPONSES.values())
+_FITNESS_KEYWORD_RE = re.compile(
+    "|".join(f"({re.escape(key)})" for key in _FITNESS_RESPONSES), re.IGNORECASE
+)
+
+# Fallback reply wraps the user's message; only the message part is counted per call
+_DEFAULT_REPLY_PREFIX = "As your AI fitness coach, I understand you're asking about: "
+_DEFAULT_REPLY_SUFFIX = " Let me help you achieve your fitness goals with personalized advice! What specific aspect would you like me to focus on - workout routines, nutrition, motivation, or recovery strategies?"
+_DEFAULT_REPLY_TOKENS = len(_DEFAULT_REPLY_PREFIX.split()) + len(_DEFAULT_REPLY_SUFFIX.split())
+
 def generate_ai_response(message: str, context: Optional[Dict[str, Any]] = None) -> tuple[str, int]:
     """Generate AI response (mock implementation)"""
     if not ai_model_loaded:
         return "AI model is currently unavailable. Please try again later.", 10
     
     # Mock AI response - in production, use actual model
-    fitness_responses = {
-        "workout": "Here's a personalized workout plan: Start with 10 minutes of dynamic warm-up, then perform 3 sets of: squats (12 reps), push-ups (10 reps), lunges (10 per leg), and plank (30 seconds). Cool down with 5 minutes of stretching.",
-        "nutrition": "For optimal nutrition, aim for: 1.6-2.2g protein per kg body weight, complex carbohydrates from whole grains, healthy fats from nuts/avocado, and 5-9 servings of fruits/vegetables daily. Stay hydrated with 2-3L water.",
-        "motivation": "Remember, progress isn't always linear! Every workout, healthy meal, and positive choice builds momentum. Consistency beats perfection - you're building stronger habits with each session. Celebrate small wins!",
-        "recovery": "Recovery is crucial for progress! Aim for 7-9 hours of quality sleep, include rest days, try active recovery like walking or gentle yoga, and listen to your body's signals.",
-        "cardio": "For effective cardio: Mix steady-state (20-30 min moderate intensity) with HIIT (15-20 min with intervals). Start with 3x/week and gradually increase. Find activities you enjoy - dancing, swimming, hiking!",
-    }
-    
-    message_lower = message.lower()
-    for key, response in fitness_responses.items():
-        if key in message_lower:
-            return response, len(response.split())
+    match = _FITNESS_KEYWORD_RE.search(message)
+    if match:
+        return _FITNESS_REPLIES[match.lastindex - 1]
     
     # Default personalized response
-    response = f"As your AI fitness coach, I understand you're asking about: {message}. Let me help you achieve your fitness goals with personalized advice! What specific aspect would you like me to focus on - workout routines, nutrition, motivation, or recovery strategies?"
-    return response, len(response.split())
+    message_part = f"{message}."
+    response = f"{_DEFAULT_REPLY_PREFIX}{message_part}{_DEFAULT_REPLY_SUFFIX}"
+    return response, _DEFAULT_REPLY_TOKENS + len(message_part.split())
 
 # System metrics helper
+# cpu_percent(interval=None) reports usage since the previous call, so prime
+# the counter at import; readings are then memoized for a short window so
+# probe bursts don't re-read memory and disk stats
+psutil.cpu_percent(interval=None)
+SYSTEM_METRICS_TTL_SECONDS = 2.0
+_system_metrics_cache: Optional[tuple] = None  # (monotonic time, (cpu, memory, disk))
+
 def get_system_metrics() -> SystemMetrics:
     """Get current system performance metrics"""
+    global _system_metrics_cache
     try:
-        cpu_percent = psutil.cpu_percent(interval=1)
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
+        now = time.monotonic()
+        if _system_metrics_cache is None or now - _system_metrics_cache[0] > SYSTEM_METRICS_TTL_SECONDS:
+            readings = (
+                psutil.cpu_percent(interval=None),
+                psutil.virtual_memory().percent,
+                psutil.disk_usage('/').percent
+            )
+            _system_metrics_cache = (now, readings)
+        cpu_percent, memory_percent, disk_percent = _system_metrics_cache[1]
         
-        return SystemMetrics(
+        return SystemMetrics.from_trusted(
             cpu_usage_percent=cpu_percent,
-            memory_usage_percent=memory.percent,
-            disk_usage_percent=disk.percent,
+            memory_usage_percent=memory_percent,
+            disk_usage_percent=disk_percent,
             uptime_seconds=time.time() - app_start_time
         )
     except Exception as e:
         logger.warning(f"Failed to get system metrics: {e}")
-        return SystemMetrics(uptime_seconds=time.time() - app_start_time)
+        return SystemMetrics.from_trusted(uptime_seconds=time.time() - app_start_time)
 
 # API Endpoints
 @app.get("/", tags=["Root"])
-async def root():
+async def root(response: Response):
     """Root endpoint with API information"""
+    response.headers["Cache-Control"] = _ROOT_CACHE_CONTROL
     return {
         "message": settings.app_name, 
         "version": settings.app_version,
@@ -227,17 +420,19 @@ async def root():
 async def health_check():
     """Comprehensive health check endpoint"""
     try:
+        now = datetime.utcnow()
+        
         # Determine overall status
         health_status = HealthStatus.HEALTHY
         checks_passed = 0
         checks_total = 2
         
         # Check AI model
-        model_status = ModelStatus(
+        model_status = ModelStatus.from_trusted(
             loaded=ai_model_loaded,
             model_name=settings.model_name if ai_model_loaded else None,
             model_path=settings.model_path if ai_model_loaded else None,
-            last_inference_time=datetime.utcnow() if ai_model_loaded else None
+            last_inference_time=now if ai_model_loaded else None
         )
         if ai_model_loaded:
             checks_passed += 1
@@ -255,9 +450,9 @@ async def health_check():
             "debug_mode": settings.debug
         }
         
-        return HealthResponse(
+        return ModelResponse(HealthResponse.from_trusted(
             status=health_status,
-            timestamp=datetime.utcnow(),
+            timestamp=now,
             version=settings.app_version,
             environment=settings.environment,
             model_status=model_status,
@@ -265,19 +460,19 @@ async def health_check():
             checks_passed=checks_passed,
             checks_total=checks_total,
             details=details
-        )
+        ))
     except Exception as e:
         logger.error(f"Health check failed: {e}")
-        return HealthResponse(
+        return ModelResponse(HealthResponse.from_trusted(
             status=HealthStatus.UNHEALTHY,
             timestamp=datetime.utcnow(),
             version=settings.app_version,
             environment=settings.environment,
-            model_status=ModelStatus(loaded=False),
-            system_metrics=SystemMetrics(uptime_seconds=time.time() - app_start_time),
+            model_status=ModelStatus.from_trusted(loaded=False),
+            system_metrics=SystemMetrics.from_trusted(uptime_seconds=time.time() - app_start_time),
             checks_passed=0,
             checks_total=2
-        )
+        ))
 
 @app.get("/health/ready", response_model=ReadinessResponse, tags=["Health"])
 async def readiness_check():
@@ -290,76 +485,89 @@ async def readiness_check():
     
     ready = all(checks.values())
     
-    return ReadinessResponse(
+    return ModelResponse(ReadinessResponse.from_trusted(
         ready=ready,
         timestamp=datetime.utcnow(),
         checks=checks
-    )
+    ))
 
 @app.get("/health/live", response_model=LivenessResponse, tags=["Health"])
-async def liveness_check():
+async def liveness_check(request: Request):
     """Kubernetes liveness probe endpoint"""
-    return LivenessResponse(
-        alive=True,
-        timestamp=datetime.utcnow(),
-        uptime_seconds=time.time() - app_start_time
+    now = time.time()
+    uptime = now - app_start_time
+    headers = {
+        "Cache-Control": _LIVENESS_CACHE_CONTROL,
+        "ETag": f'"{int(app_start_time)}-{int(uptime)}"'
+    }
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(
+        content=_LIVENESS_TEMPLATE % (now, uptime),
+        media_type="application/json",
+        headers=headers
     )
 
 @app.post("/auth/register", response_model=TokenResponse, tags=["Authentication"])
-async def register_user(user_data: UserRegister):
+async def register_user(user_data: UserRegister, request: Request):
     """Register a new user with enhanced validation"""
     # Check if user already exists
-    for existing_user in users_db.values():
-        if existing_user["email"] == user_data.email:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="User with this email already exists"
-            )
+    email_key = user_data.email.lower()
+    if email_key in email_to_user_id:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="User with this email already exists"
+        )
     
     # Create new user
-    user_id = str(uuid.uuid4())
-    hashed_password = hash_password(user_data.password)
+    user_id = uuid.uuid4().hex
+    hashed_password = await run_in_threadpool(hash_password, user_data.password)
     
-    user_record = {
-        "user_id": user_id,
-        "email": user_data.email,
-        "password": hashed_password,
-        "first_name": user_data.first_name,
-        "last_name": user_data.last_name,
-        "fitness_goals": user_data.fitness_goals,
-        "created_at": datetime.utcnow(),
-        "last_active": datetime.utcnow(),
-        "is_active": True
-    }
+    # A concurrent registration may have claimed the email while hashing
+    if email_key in email_to_user_id:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="User with this email already exists"
+        )
+    
+    user_record = UserRecord(
+        user_id=user_id,
+        email=user_data.email,
+        password=hashed_password,
+        first_name=user_data.first_name,
+        last_name=user_data.last_name,
+        fitness_goals=user_data.fitness_goals,
+        created_at=request.state.now,
+        last_active=request.state.now,
+        is_active=True,
+        total_conversations=0,
+        first_conversation_at=None
+    )
     
     users_db[user_id] = user_record
+    email_to_user_id[email_key] = user_id
     
     # Initialize conversation history
-    conversations_db[user_id] = []
+    conversations_db[user_id] = deque(maxlen=settings.max_history)
     
     # Generate access token
     access_token = create_access_token({"user_id": user_id, "email": user_data.email})
     
     logger.info(f"New user registered: {user_data.email}")
     
-    return TokenResponse(
+    return ModelResponse(TokenResponse.from_trusted(
         access_token=access_token,
         token_type="bearer",
         expires_in=settings.access_token_expire_minutes * 60,
         user_id=user_id
-    )
+    ))
 
 @app.post("/auth/login", response_model=TokenResponse, tags=["Authentication"])
-async def login_user(login_data: UserLogin):
+async def login_user(login_data: UserLogin, request: Request):
     """User login with enhanced security"""
     # Find user by email
-    user = None
-    user_id = None
-    for uid, user_data in users_db.items():
-        if user_data["email"] == login_data.email:
-            user = user_data
-            user_id = uid
-            break
+    user_id = email_to_user_id.get(login_data.email.lower())
+    user = users_db.get(user_id) if user_id else None
     
     if not user:
         raise HTTPException(
@@ -368,38 +576,39 @@ async def login_user(login_data: UserLogin):
         )
     
     # Verify password
-    if not verify_password(login_data.password, user["password"]):
+    if not await run_in_threadpool(verify_password, login_data.password, user.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
         )
     
     # Update last active
-    user["last_active"] = datetime.utcnow()
+    touch_last_active(user, request.state.now)
     
     # Generate access token
-    access_token = create_access_token({"user_id": user_id, "email": user["email"]})
+    access_token = create_access_token({"user_id": user_id, "email": user.email})
     
-    logger.info(f"User logged in: {user['email']}")
+    logger.info(f"User logged in: {user.email}")
     
-    return TokenResponse(
+    return ModelResponse(TokenResponse.from_trusted(
         access_token=access_token,
         token_type="bearer",
         expires_in=settings.access_token_expire_minutes * 60,
         user_id=user_id
-    )
+    ))
 
 @app.post("/chat", response_model=ChatResponse, tags=["Chat"])
 async def chat_with_ai(
     chat_request: ChatRequest,
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    request: Request,
+    current_user: UserRecord = Depends(get_current_user)
 ):
     """Chat with AI fitness assistant - enhanced version"""
-    user_id = current_user["user_id"]
-    start_time = time.time()
+    user_id = current_user.user_id
+    start_ns = time.monotonic_ns()
     
     # Generate conversation ID if not provided
-    conversation_id = chat_request.conversation_id or str(uuid.uuid4())
+    conversation_id = chat_request.conversation_id or uuid.uuid4().hex
     
     # Generate AI response
     try:
@@ -409,128 +618,146 @@ async def chat_with_ai(
         raise ModelException("Failed to generate AI response")
     
     # Calculate response time
-    response_time_ms = int((time.time() - start_time) * 1000)
+    response_time_ms = (time.monotonic_ns() - start_ns) // 1_000_000
     
     # Create conversation record
-    conversation_record = {
-        "conversation_id": conversation_id,
-        "user_message": chat_request.message,
-        "ai_response": ai_response,
-        "timestamp": datetime.utcnow(),
-        "context": chat_request.context,
-        "tokens_used": tokens_used,
-        "response_time_ms": response_time_ms
-    }
+    conversation_record = ConversationRecord(
+        conversation_id=conversation_id,
+        user_message=chat_request.message,
+        ai_response=ai_response,
+        timestamp=request.state.now,
+        context=chat_request.context,
+        tokens_used=tokens_used,
+        response_time_ms=response_time_ms
+    )
     
     # Save to conversation history
-    if user_id not in conversations_db:
-        conversations_db[user_id] = []
-    
-    conversations_db[user_id].append(conversation_record)
+    history = conversations_db.get(user_id)
+    if history is None:
+        history = conversations_db[user_id] = deque(maxlen=settings.max_history)
+    history.append(conversation_record)
+    current_user.total_conversations += 1
+    if current_user.first_conversation_at is None:
+        current_user.first_conversation_at = conversation_record.timestamp
     
     # Update user's last active time
-    current_user["last_active"] = datetime.utcnow()
+    touch_last_active(current_user, request.state.now)
     
     logger.info(f"Chat response generated for user {user_id}: {tokens_used} tokens, {response_time_ms}ms")
     
-    return ChatResponse(
+    return ModelResponse(ChatResponse(
         message=chat_request.message,
         response=ai_response,
         conversation_id=conversation_id,
-        timestamp=conversation_record["timestamp"],
+        timestamp=conversation_record.timestamp,
         tokens_used=tokens_used,
         response_time_ms=response_time_ms
-    )
+    ))
 
 @app.get("/chat/history/{user_id}", tags=["Chat"])
 async def get_conversation_history(
     user_id: str,
-    limit: Optional[int] = 50,
-    offset: Optional[int] = 0,
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    layout: Literal["rows", "columnar"] = Query("rows", alias="format"),
+    current_user: UserRecord = Depends(get_current_user)
 ):
     """Get conversation history for a user"""
     # Check if user is requesting their own history or is admin
-    if current_user["user_id"] != user_id:
+    if current_user.user_id != user_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied: Can only access your own conversation history"
         )
     
     # Get conversations for user
-    user_conversations = conversations_db.get(user_id, [])
+    user_conversations = conversations_db.get(user_id, ())
     
     # Apply pagination
     total_conversations = len(user_conversations)
-    conversations_slice = user_conversations[offset:offset + limit]
-    
-    return {
+    page = {
         "user_id": user_id,
         "total_conversations": total_conversations,
         "limit": limit,
-        "offset": offset,
-        "conversations": conversations_slice
+        "offset": offset
     }
+    
+    if layout == "rows":
+        # orjson writes the slotted records directly, in field order; datetimes
+        # are passed through so they go out as epoch seconds
+        page["conversations"] = list(islice(user_conversations, offset, offset + limit))
+        content = orjson.dumps(page, default=epoch_seconds, option=orjson.OPT_PASSTHROUGH_DATETIME)
+    else:
+        conversations_slice = list(islice(user_conversations, offset, offset + limit))
+        # One list per field for bulk consumers: fewer repeated keys on the wire
+        page.update(
+            conversation_ids=[conv.conversation_id for conv in conversations_slice],
+            user_messages=[conv.user_message for conv in conversations_slice],
+            ai_responses=[conv.ai_response for conv in conversations_slice],
+            timestamps=[conv.timestamp for conv in conversations_slice],
+            contexts=[conv.context for conv in conversations_slice],
+            tokens_used=[conv.tokens_used for conv in conversations_slice],
+            response_times_ms=[conv.response_time_ms for conv in conversations_slice]
+        )
+        content = conversation_turns_columnar_adapter.dump_json(page)
+    
+    return Response(content=content, media_type="application/json")
 
 @app.get("/profile", response_model=UserProfile, tags=["User"])
-async def get_user_profile(current_user: Dict[str, Any] = Depends(get_current_user)):
+async def get_user_profile(current_user: UserRecord = Depends(get_current_user)):
     """Get current user's profile"""
-    return UserProfile(
-        user_id=current_user["user_id"],
-        email=current_user["email"],
-        first_name=current_user["first_name"],
-        last_name=current_user["last_name"],
-        fitness_goals=current_user.get("fitness_goals"),
-        created_at=current_user["created_at"],
-        last_active=current_user["last_active"]
-    )
+    return ModelResponse(UserProfile.from_trusted(
+        user_id=current_user.user_id,
+        email=current_user.email,
+        first_name=current_user.first_name,
+        last_name=current_user.last_name,
+        fitness_goals=current_user.fitness_goals,
+        created_at=current_user.created_at,
+        last_active=current_user.last_active
+    ))
 
 @app.put("/profile", tags=["User"])
 async def update_user_profile(
     profile_update: UpdateProfile,
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    request: Request,
+    current_user: UserRecord = Depends(get_current_user)
 ):
     """Update user profile with validation"""
-    user_id = current_user["user_id"]
+    user_id = current_user.user_id
     
     # Update fields if provided
     if profile_update.first_name is not None:
-        users_db[user_id]["first_name"] = profile_update.first_name
+        current_user.first_name = profile_update.first_name
     if profile_update.last_name is not None:
-        users_db[user_id]["last_name"] = profile_update.last_name
+        current_user.last_name = profile_update.last_name
     if profile_update.fitness_goals is not None:
-        users_db[user_id]["fitness_goals"] = profile_update.fitness_goals
+        current_user.fitness_goals = profile_update.fitness_goals
     
-    users_db[user_id]["last_active"] = datetime.utcnow()
+    touch_last_active(current_user, request.state.now)
     
     logger.info(f"Profile updated for user {user_id}")
     
-    return {"message": "Profile updated successfully", "timestamp": datetime.utcnow()}
+    return {"message": "Profile updated successfully", "timestamp": request.state.now}
 
 @app.get("/stats", response_model=UserStats, tags=["Analytics"])
-async def get_user_stats(current_user: Dict[str, Any] = Depends(get_current_user)):
+async def get_user_stats(current_user: UserRecord = Depends(get_current_user)):
     """Get comprehensive user statistics"""
-    user_id = current_user["user_id"]
-    user_conversations = conversations_db.get(user_id, [])
-    
-    total_conversations = len(user_conversations)
-    total_messages = sum(1 for conv in user_conversations)
-    
     # Calculate usage over time
-    if user_conversations:
-        first_conversation = min(conv["timestamp"] for conv in user_conversations)
+    first_conversation = current_user.first_conversation_at
+    if first_conversation is not None:
         days_active = (datetime.utcnow() - first_conversation).days + 1
     else:
         days_active = 0
     
-    return UserStats(
-        user_id=user_id,
-        total_conversations=total_conversations,
-        total_messages=total_messages,
+    # Each conversation record is one message exchange, so both totals match
+    return ModelResponse(UserStats.from_trusted(
+        user_id=current_user.user_id,
+        total_conversations=current_user.total_conversations,
+        total_messages=current_user.total_conversations,
         days_active=days_active,
-        member_since=current_user["created_at"],
-        last_active=current_user["last_active"]
-    )
+        member_since=current_user.created_at,
+        last_active=current_user.last_active
+    ))
 
 # Application entry point
 if __name__ == "__main__":
@@ -549,5 +776,7 @@ if __name__ == "__main__":
         port=settings.port,
         reload=settings.debug,
         workers=1 if settings.debug else settings.workers,
+        loop="uvloop",
+        http="httptools",
         log_level=settings.log_level.lower()
     )
\ No newline at end of file
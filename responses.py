@@ -0,0 +1,19 @@
+"""
+Response Classes for AI Fitness Assistant API
+"""
+
+from typing import Any
+
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+class ModelResponse(ORJSONResponse):
+    """JSON response that serializes Pydantic models in a single pydantic-core pass"""
+
+    def render(self, content: Any) -> bytes:
+        # Models go straight to JSON bytes in Rust, skipping the intermediate
+        # dict; anything else falls back to orjson
+        if isinstance(content, BaseModel):
+            return content.model_dump_json().encode("utf-8")
+        return super().render(content)
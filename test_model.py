@@ -34,7 +34,11 @@ def test_model_files():
     model_path = os.getenv('MODEL_PATH', './models/mistral-7b-instruct')
     model_dir = Path(model_path)
     
-    if not model_dir.exists():
+    # One directory listing answers every check below
+    try:
+        with os.scandir(model_dir) as it:
+            entries = {entry.name: entry for entry in it}
+    except (FileNotFoundError, NotADirectoryError):
         print(f"❌ Model directory does not exist: {model_dir}")
         return False
     
@@ -50,20 +54,19 @@ def test_model_files():
     
     missing_files = []
     for file_name in required_files:
-        file_path = model_dir / file_name
-        if file_path.exists():
+        if file_name in entries:
             print(f"✅ Found: {file_name}")
         else:
             print(f"❌ Missing: {file_name}")
             missing_files.append(file_name)
     
     # Check for model weights (safetensors files)
-    safetensors_files = list(model_dir.glob("*.safetensors"))
+    safetensors_files = [entry for name, entry in entries.items() if name.endswith(".safetensors")]
     if safetensors_files:
         print(f"✅ Found {len(safetensors_files)} safetensors files")
-        for file in safetensors_files:
-            size_mb = file.stat().st_size / (1024 * 1024)
-            print(f"   - {file.name}: {size_mb:.1f} MB")
+        for entry in safetensors_files:
+            size_mb = entry.stat().st_size / (1024 * 1024)
+            print(f"   - {entry.name}: {size_mb:.1f} MB")
     else:
         print("❌ No safetensors model files found")
         missing_files.append("*.safetensors")